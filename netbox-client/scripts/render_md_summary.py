@@ -379,8 +379,7 @@ def write_markdown_file(content: str, output_path: Path) -> None:
         output_path: Path to write the Markdown file
     """
     try:
-        with open(output_path, "w") as f:
-            f.write(content)
+        output_path.write_text(content)
         print(f"✅ Generated: {output_path}")
     except Exception as e:
         print(f"❌ Error writing {output_path}: {e}")
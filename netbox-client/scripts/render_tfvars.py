@@ -22,6 +22,10 @@ Usage:
     python netbox-client/scripts/render_tfvars.py \
         --input-dir artifacts/intent-export --output-dir /tmp/tfvars
 
+    # Render sites in parallel with 4 worker processes
+    python netbox-client/scripts/render_tfvars.py \
+        --input-dir artifacts/intent-export --jobs 4
+
 Output:
     Generates files in artifacts/tfvars/:
     - site-pennington.tfvars.json
@@ -82,15 +86,26 @@ Features:
 """
 
 import argparse
+import heapq
 import json
+import os
 import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+# Top-level keys of a consolidated NetBox export; tags are optional
+EXPORT_KEYS = ("sites", "prefixes", "vlans", "tags")
+REQUIRED_EXPORT_KEYS = frozenset(("sites", "prefixes", "vlans"))
 
 
 def load_json_file(file_path: Path) -> Dict[str, Any]:
     """Load and parse a JSON file.
 
+    The file is read as bytes in one call and parsed with json.loads.
+
     Args:
         file_path: Path to the JSON file
 
@@ -102,8 +117,7 @@ def load_json_file(file_path: Path) -> Dict[str, Any]:
         json.JSONDecodeError: If the file is not valid JSON
     """
     try:
-        with open(file_path, "r") as f:
-            return json.load(f)
+        return json.loads(file_path.read_bytes())
     except FileNotFoundError:
         print(f"❌ Error: File not found: {file_path}")
         raise
@@ -134,18 +148,12 @@ def load_netbox_export(
         data = load_json_file(input_file)
 
         # Validate required keys
-        required_keys = ["sites", "prefixes", "vlans"]
-        missing_keys = [key for key in required_keys if key not in data]
+        missing_keys = REQUIRED_EXPORT_KEYS - data.keys()
         if missing_keys:
-            print(f"⚠️  Warning: Missing keys in input file: {missing_keys}")
+            print(f"⚠️  Warning: Missing keys in input file: {sorted(missing_keys)}")
 
         # Ensure all expected keys exist with defaults
-        result = {
-            "sites": data.get("sites", []),
-            "prefixes": data.get("prefixes", []),
-            "vlans": data.get("vlans", []),
-            "tags": data.get("tags", []),
-        }
+        result = {key: data.get(key, []) for key in EXPORT_KEYS}
 
         print(f"   Loaded {len(result['sites'])} site(s)")
         print(f"   Loaded {len(result['prefixes'])} prefix(es)")
@@ -166,7 +174,7 @@ def load_netbox_export(
         }
 
         # Load each resource type
-        for resource_name in ["sites", "prefixes", "vlans", "tags"]:
+        for resource_name in EXPORT_KEYS:
             file_path = input_dir / f"{resource_name}.json"
             if file_path.exists():
                 data = load_json_file(file_path)
@@ -220,6 +228,23 @@ def extract_site_slug(site_data: Dict[str, Any]) -> str:
     return site_data.get("slug", site_data.get("name", "unknown"))
 
 
+def _resolve_site_key(site_field: Any) -> Optional[str]:
+    """Resolve a site reference to the key used for site matching.
+
+    Args:
+        site_field: Site field value (nested object, plain string, or None)
+
+    Returns:
+        Site slug (or name if slug is missing) for nested objects, the
+        string itself for plain strings, or None if site cannot be determined
+    """
+    if isinstance(site_field, dict):
+        return site_field.get("slug", site_field.get("name"))
+    elif isinstance(site_field, str):
+        return site_field
+    return None
+
+
 def extract_site_from_vlan(vlan_data: Dict[str, Any]) -> Optional[str]:
     """Extract site slug from VLAN data.
 
@@ -231,12 +256,7 @@ def extract_site_from_vlan(vlan_data: Dict[str, Any]) -> Optional[str]:
     Returns:
         Site slug string, or None if site cannot be determined
     """
-    vlan_site = vlan_data.get("site")
-    if isinstance(vlan_site, dict):
-        return vlan_site.get("slug", vlan_site.get("name"))
-    elif isinstance(vlan_site, str):
-        return vlan_site
-    return None
+    return _resolve_site_key(vlan_data.get("site"))
 
 
 def extract_vlan_id(vlan_data: Dict[str, Any]) -> int:
@@ -427,7 +447,7 @@ def extract_prefix_site(
     vlan = prefix.get("vlan")
     if vlan and isinstance(vlan, dict):
         # Method 2a: Try to get site from full VLAN object (if available)
-        vlan_site_slug = extract_site_from_vlan({"site": vlan.get("site")})
+        vlan_site_slug = _resolve_site_key(vlan.get("site"))
         vlan_vid = vlan.get("vid")
         if vlan_vid is None:
             vlan_vid = vlan.get("vlan_id")
@@ -477,27 +497,9 @@ def filter_resources_by_site(
     unmatched = []
 
     for resource in resources:
-        resource_site_slug = None
-
-        if resource_type == "prefix":
-            # Use VLAN-based matching for prefixes
-            if vlan_site_mapping is None or vlan_id_to_site is None:
-                raise ValueError(
-                    "vlan_site_mapping and vlan_id_to_site required "
-                    "for prefix filtering"
-                )
-            resource_site_slug = extract_prefix_site(
-                resource, vlan_site_mapping, vlan_id_to_site
-            )
-        else:
-            # Direct site field for VLANs
-            resource_site = resource.get("site")
-            if isinstance(resource_site, dict):
-                resource_site_slug = resource_site.get(
-                    "slug", resource_site.get("name")
-                )
-            else:
-                resource_site_slug = resource_site
+        resource_site_slug = resolve_resource_site(
+            resource, resource_type, vlan_site_mapping, vlan_id_to_site
+        )
 
         # Match against site slug or name
         if resource_site_slug == site_slug or resource_site_slug == site_name:
@@ -505,7 +507,20 @@ def filter_resources_by_site(
         elif resource_site_slug is None:
             unmatched.append(resource)
 
-    # Log unmatched resources for debugging
+    log_unmatched_resources(unmatched, resource_type)
+
+    return filtered
+
+
+def log_unmatched_resources(
+    unmatched: List[Dict[str, Any]], resource_type: str
+) -> None:
+    """Log resources that could not be associated with any site.
+
+    Args:
+        unmatched: Resources whose site could not be determined
+        resource_type: Type of resource ("prefix" or "vlan")
+    """
     if unmatched:
         print(f"  ⚠️  {len(unmatched)} {resource_type}(s) without site association:")
         for res in unmatched[:3]:  # Show first 3
@@ -527,97 +542,253 @@ def filter_resources_by_site(
         if len(unmatched) > 3:
             print(f"     ... and {len(unmatched) - 3} more")
 
-    return filtered
+
+def resolve_resource_site(
+    resource: Dict[str, Any],
+    resource_type: str,
+    vlan_site_mapping: Optional[Dict[tuple[str, int], str]] = None,
+    vlan_id_to_site: Optional[Dict[int, str]] = None,
+) -> Optional[str]:
+    """Resolve the site key a prefix or VLAN belongs to.
+
+    Args:
+        resource: Resource dictionary (prefix or VLAN)
+        resource_type: Type of resource ("prefix" or "vlan")
+        vlan_site_mapping: (site_slug, vid) → site slug mapping
+            (required for prefixes)
+        vlan_id_to_site: internal_vlan_id → site slug mapping
+            (required for prefixes)
+
+    Returns:
+        Site slug (or name), or None if site cannot be determined
+
+    Raises:
+        ValueError: If prefix mappings are missing
+    """
+    if resource_type == "prefix":
+        # Use VLAN-based matching for prefixes
+        if vlan_site_mapping is None or vlan_id_to_site is None:
+            raise ValueError(
+                "vlan_site_mapping and vlan_id_to_site required for prefix filtering"
+            )
+        return extract_prefix_site(resource, vlan_site_mapping, vlan_id_to_site)
+
+    # Direct site field for VLANs
+    return _resolve_site_key(resource.get("site"))
+
+
+def index_resources_by_site(
+    resources: List[Dict[str, Any]],
+    resource_type: str,
+    vlan_site_mapping: Optional[Dict[tuple[str, int], str]] = None,
+    vlan_id_to_site: Optional[Dict[int, str]] = None,
+) -> Dict[Optional[str], List[Tuple[int, Dict[str, Any]]]]:
+    """Group resources (prefixes or VLANs) by resolved site in a single pass.
+
+    Resolving each resource once up front lets main() look up a site's
+    resources directly instead of re-scanning every resource per site.
+
+    Args:
+        resources: List of resource dictionaries
+        resource_type: Type of resource ("prefix" or "vlan")
+        vlan_site_mapping: (site_slug, vid) → site slug mapping
+            (for composite key lookups)
+        vlan_id_to_site: internal_vlan_id → site slug mapping
+            (for sparse VLAN lookups)
+
+    Returns:
+        Dictionary mapping site key to (input position, resource) pairs.
+        Resources without a site association are stored under None.
+    """
+    index = defaultdict(list)
+
+    for position, resource in enumerate(resources):
+        site_key = resolve_resource_site(
+            resource, resource_type, vlan_site_mapping, vlan_id_to_site
+        )
+        index[site_key].append((position, resource))
+
+    return index
+
+
+def select_site_resources(
+    index: Dict[Optional[str], List[Tuple[int, Dict[str, Any]]]],
+    site_slug: str,
+    site_name: str,
+) -> List[Dict[str, Any]]:
+    """Select a site's resources from an index built by index_resources_by_site.
+
+    Matches on site slug or name, like filter_resources_by_site, and keeps
+    the resources in their original input order.
+
+    Args:
+        index: Site index from index_resources_by_site
+        site_slug: Site slug to select
+        site_name: Site name to select (fallback)
+
+    Returns:
+        Resources belonging to the specified site
+    """
+    by_slug = index.get(site_slug, [])
+    by_name = index.get(site_name, []) if site_name != site_slug else []
+    return [
+        resource for _, resource in heapq.merge(by_slug, by_name, key=itemgetter(0))
+    ]
+
+
+def render_tags(tags: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Render Terraform tag variables.
+
+    Tags are the same for every site, so main() renders them once and passes
+    the result to render_site_tfvars for each site.
+
+    Args:
+        tags: List of all tags from NetBox
+
+    Returns:
+        List of tag dictionaries ready for JSON serialization
+    """
+    # Keys are inserted in sorted order (see format_tfvars presorted)
+    return [
+        {
+            "color": tag.get("color", ""),
+            "description": tag.get("description", ""),
+            "name": tag.get("name", ""),
+            "slug": tag.get("slug", tag.get("name", "")),
+        }
+        for tag in tags
+    ]
 
 
 def render_site_tfvars(
     site: Dict[str, Any],
     prefixes: List[Dict[str, Any]],
     vlans: List[Dict[str, Any]],
-    tags: List[Dict[str, Any]],
+    tags: Optional[List[Dict[str, Any]]],
+    rendered_tags: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
     """Render Terraform variables for a single site.
 
+    All dictionaries are built with their keys in sorted order, so the
+    result can be serialized with format_tfvars(..., presorted=True).
+
     Args:
         site: Site data from NetBox
         prefixes: List of prefixes for this site
         vlans: List of VLANs for this site
-        tags: List of all tags (included in every site)
+        tags: List of all tags (included in every site); may be None when
+            rendered_tags is given
+        rendered_tags: Tags already rendered by render_tags; when given,
+            tags is not read
 
     Returns:
         Dictionary of Terraform variables ready for JSON serialization
     """
-    # Map site fields
-    tfvars = {
-        "site_name": site.get("name", ""),
-        "site_slug": extract_site_slug(site),
-        "site_description": site.get("description", ""),
-    }
-
     # Map prefixes
-    tfvars["prefixes"] = [
+    tfvars_prefixes = [
         {
             "cidr": prefix.get("prefix", ""),
-            "vlan_id": extract_vlan_association(prefix),
             "description": prefix.get("description", ""),
             "status": extract_status_value(prefix.get("status")),
+            "vlan_id": extract_vlan_association(prefix),
         }
         for prefix in prefixes
     ]
 
     # Map VLANs with validation
-    tfvars_vlans = []
-    for vlan in vlans:
-        try:
-            vlan_id = extract_vlan_id(vlan)
-            tfvars_vlans.append(
-                {
-                    "vlan_id": vlan_id,
-                    "name": vlan.get("name", ""),
-                    "description": vlan.get("description", ""),
-                    "status": extract_status_value(vlan.get("status")),
-                }
-            )
-        except ValueError as e:
-            # Re-raise with context about which site is being processed
-            site_name = site.get("name", "unknown")
-            raise ValueError(f"Error processing site '{site_name}': {e}") from e
+    try:
+        tfvars_vlans = [
+            {
+                "description": vlan.get("description", ""),
+                "name": vlan.get("name", ""),
+                "status": extract_status_value(vlan.get("status")),
+                "vlan_id": extract_vlan_id(vlan),
+            }
+            for vlan in vlans
+        ]
+    except ValueError as e:
+        # Re-raise with context about which site is being processed
+        site_name = site.get("name", "unknown")
+        raise ValueError(f"Error processing site '{site_name}': {e}") from e
+
+    # Map site fields; tags are the same for all sites
+    return {
+        "prefixes": tfvars_prefixes,
+        "site_description": site.get("description", ""),
+        "site_name": site.get("name", ""),
+        "site_slug": extract_site_slug(site),
+        "tags": rendered_tags if rendered_tags is not None else render_tags(tags),
+        "vlans": tfvars_vlans,
+    }
 
-    tfvars["vlans"] = tfvars_vlans
 
-    # Map tags (same for all sites)
-    tfvars["tags"] = [
-        {
-            "name": tag.get("name", ""),
-            "slug": tag.get("slug", tag.get("name", "")),
-            "description": tag.get("description", ""),
-            "color": tag.get("color", ""),
-        }
-        for tag in tags
-    ]
+def format_tfvars(tfvars: Dict[str, Any], presorted: bool = False) -> str:
+    """Serialize tfvars data to JSON text with deterministic formatting.
 
-    return tfvars
+    Uses sorted keys and consistent indentation for deterministic output.
+
+    Args:
+        tfvars: Terraform variables dictionary
+        presorted: Set when every dictionary already has its keys in sorted
+            insertion order (as produced by render_site_tfvars), which skips
+            the per-dictionary key sort during serialization
+
+    Returns:
+        JSON text with a trailing newline
+    """
+    return json.dumps(tfvars, indent=2, sort_keys=not presorted) + "\n"
 
 
 def write_tfvars_file(tfvars: Dict[str, Any], output_path: Path) -> None:
     """Write tfvars data to a JSON file with deterministic formatting.
 
-    Uses sorted keys and consistent indentation for deterministic output.
-
     Args:
         tfvars: Terraform variables dictionary
         output_path: Path to write the JSON file
     """
+    write_tfvars_text(format_tfvars(tfvars), output_path)
+
+
+def write_tfvars_text(content: str, output_path: Path, quiet: bool = False) -> None:
+    """Write already-serialized tfvars JSON text to a file.
+
+    Args:
+        content: JSON text produced by format_tfvars
+        output_path: Path to write the JSON file
+        quiet: Suppress the per-file success message
+    """
     try:
-        with open(output_path, "w") as f:
-            json.dump(tfvars, f, indent=2, sort_keys=True)
-            f.write("\n")  # Add trailing newline
-        print(f"✅ Generated: {output_path}")
+        # The content is complete, so write it with unbuffered syscalls rather
+        # than through Python's text and buffered I/O layers
+        payload = memoryview(content.encode("utf-8"))
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            while payload:
+                payload = payload[os.write(fd, payload) :]
+        finally:
+            os.close(fd)
+        if not quiet:
+            print(f"✅ Generated: {output_path}")
     except Exception as e:
         print(f"❌ Error writing {output_path}: {e}")
         raise
 
 
+def render_site_tfvars_text(task: Tuple[Any, ...]) -> str:
+    """Render and serialize tfvars for one site.
+
+    Module-level so it can be dispatched to ProcessPoolExecutor workers.
+
+    Args:
+        task: (site, prefixes, vlans, tags, rendered_tags) arguments for
+            render_site_tfvars
+
+    Returns:
+        JSON text produced by format_tfvars
+    """
+    return format_tfvars(render_site_tfvars(*task), presorted=True)
+
+
 def main():
     """Main function to handle command-line arguments and render tfvars files."""
     parser = argparse.ArgumentParser(
@@ -634,6 +805,12 @@ Examples:
   # Specify custom output directory
   python render_tfvars.py --input-dir artifacts/intent-export --output-dir /tmp/tfvars
 
+  # Render sites in parallel with 4 worker processes
+  python render_tfvars.py --input-dir artifacts/intent-export --jobs 4
+
+  # Skip per-site progress output on large exports
+  python render_tfvars.py --input-dir artifacts/intent-export --quiet
+
 NetBox Field Mapping:
   Sites:      name → site_name, slug → site_slug, description → site_description
   Prefixes:   prefix → cidr, vlan → vlan_id, description → description, status → status
@@ -671,6 +848,22 @@ Output Files:
         help="Output directory for tfvars files (default: artifacts/tfvars)",
     )
 
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes used to render site files "
+            "(default: 1, render serially)"
+        ),
+    )
+
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress per-site progress output (summary and errors still shown)",
+    )
+
     args = parser.parse_args()
 
     print("=" * 70)
@@ -715,64 +908,83 @@ Output Files:
     print(f"   Internal ID mapping: {len(vlan_id_to_site)} VLANs")
     print()
 
+    # Index prefixes and VLANs by site once, instead of re-scanning per site
+    prefix_index = index_resources_by_site(
+        all_prefixes, "prefix", vlan_site_mapping, vlan_id_to_site
+    )
+    vlan_index = index_resources_by_site(all_vlans, "vlan")
+    log_unmatched_resources([r for _, r in prefix_index.get(None, [])], "prefix")
+    log_unmatched_resources([r for _, r in vlan_index.get(None, [])], "vlan")
+
     # Generate tfvars file for each site
     print("🔨 Generating tfvars files...")
     print()
 
+    # Tags are identical for every site, so render them once
+    rendered_tags = render_tags(all_tags)
+
+    render_tasks = []
     generated_files = []
     for site in sites:
         site_slug = extract_site_slug(site)
         site_name = site.get("name", site_slug)
 
-        print(f"Processing site: {site_name} ({site_slug})")
-
-        # Filter prefixes and VLANs for this site using VLAN-based matching
-        site_prefixes = filter_resources_by_site(
-            all_prefixes,
-            site_slug,
-            site_name,
-            "prefix",
-            vlan_site_mapping,
-            vlan_id_to_site,
-        )
-
-        site_vlans = filter_resources_by_site(all_vlans, site_slug, site_name, "vlan")
+        # Look up prefixes and VLANs for this site (VLAN-based prefix matching)
+        site_prefixes = select_site_resources(prefix_index, site_slug, site_name)
+        site_vlans = select_site_resources(vlan_index, site_slug, site_name)
 
         # Filter VLANs to only include those with corresponding prefixes
         # This ensures Terraform contract compliance: each VLAN must have a network
         prefix_vlan_ids = {
-            extract_vlan_association(p)
+            vlan_vid
             for p in site_prefixes
-            if extract_vlan_association(p) is not None
+            if (vlan_vid := extract_vlan_association(p)) is not None
         }
         site_vlans_with_prefixes = [
             v for v in site_vlans if extract_vlan_id(v) in prefix_vlan_ids
         ]
 
-        if len(site_vlans_with_prefixes) < len(site_vlans):
-            skipped = len(site_vlans) - len(site_vlans_with_prefixes)
-            print(
-                f"  ⚠️  Skipping {skipped} VLAN(s) without prefix assignments "
-                f"(Terraform requires each VLAN to have a network)"
+        # Emit each site's progress block with a single write
+        if not args.quiet:
+            progress = f"Processing site: {site_name} ({site_slug})\n"
+            if len(site_vlans_with_prefixes) < len(site_vlans):
+                skipped = len(site_vlans) - len(site_vlans_with_prefixes)
+                progress += (
+                    f"  ⚠️  Skipping {skipped} VLAN(s) without prefix assignments "
+                    f"(Terraform requires each VLAN to have a network)\n"
+                )
+            sys.stdout.write(
+                f"{progress}"
+                f"  - {len(site_prefixes)} prefix(es)\n"
+                f"  - {len(site_vlans_with_prefixes)} VLAN(s)\n"
+                f"  - {len(all_tags)} tag(s) (shared)\n\n"
             )
 
-        print(f"  - {len(site_prefixes)} prefix(es)")
-        print(f"  - {len(site_vlans_with_prefixes)} VLAN(s)")
-        print(f"  - {len(all_tags)} tag(s) (shared)")
-
-        # Render tfvars for this site
-        tfvars = render_site_tfvars(
-            site, site_prefixes, site_vlans_with_prefixes, all_tags
+        # Tags are already rendered, so the raw list is not sent to workers
+        render_tasks.append(
+            (site, site_prefixes, site_vlans_with_prefixes, None, rendered_tags)
         )
 
-        # Write to file
         # If slug already starts with "site-", don't add it again
         if site_slug.startswith("site-"):
             output_file = args.output_dir / f"{site_slug}.tfvars.json"
         else:
             output_file = args.output_dir / f"site-{site_slug}.tfvars.json"
-        write_tfvars_file(tfvars, output_file)
         generated_files.append(output_file)
+
+    # Render sites (optionally in parallel); map() keeps the input order, so
+    # files are written and reported in the same order as the sites
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            contents = list(
+                executor.map(render_site_tfvars_text, render_tasks, chunksize=4)
+            )
+    else:
+        contents = [render_site_tfvars_text(task) for task in render_tasks]
+
+    for content, output_file in zip(contents, generated_files):
+        write_tfvars_text(content, output_file, quiet=args.quiet)
+    if not args.quiet:
         print()
 
     # Summary
@@ -24,6 +24,10 @@ Usage:
     python netbox-client/scripts/render_unifi.py \
         --input-dir artifacts/intent-export --output-dir /tmp/unifi
 
+    # Render sites in parallel with 4 worker processes
+    python netbox-client/scripts/render_unifi.py \
+        --input-dir artifacts/intent-export --jobs 4
+
 Output:
     Generates files in artifacts/unifi/:
     - site-pennington.json
@@ -62,14 +66,20 @@ Features:
 
 import argparse
 import json
+import os
 import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 
 def load_json_file(file_path: Path) -> Dict[str, Any]:
     """Load and parse a JSON file.
 
+    The file is read as bytes in one call and parsed with json.loads.
+
     Args:
         file_path: Path to the JSON file
 
@@ -81,8 +91,7 @@ def load_json_file(file_path: Path) -> Dict[str, Any]:
         json.JSONDecodeError: If the file is not valid JSON
     """
     try:
-        with open(file_path, "r") as f:
-            return json.load(f)
+        return json.loads(file_path.read_bytes())
     except FileNotFoundError:
         print(f"❌ Error: File not found: {file_path}")
         raise
@@ -220,6 +229,126 @@ def extract_site_slug(site_data: Dict[str, Any]) -> str:
     return site_data.get("slug", site_data.get("name", "unknown"))
 
 
+def _resolve_site_key(site_field: Any) -> Optional[str]:
+    """Resolve a resource's site field to the key used for site matching.
+
+    Args:
+        site_field: Site field value (nested object, plain string, or None)
+
+    Returns:
+        Site slug (or name if slug is missing) for nested objects, the
+        string itself for plain strings, or None if site cannot be determined
+    """
+    # Handle both string (minimal schema) and object (API export)
+    if isinstance(site_field, dict):
+        return site_field.get("slug", site_field.get("name"))
+    elif isinstance(site_field, str):
+        return site_field
+    return None
+
+
+def index_vlans_by_site(
+    vlans: List[Dict[str, Any]],
+) -> Dict[Any, List[Tuple[int, Dict[str, Any]]]]:
+    """Group VLANs by site key in a single pass.
+
+    Args:
+        vlans: List of all VLANs from NetBox
+
+    Returns:
+        Mapping of site key to (position, VLAN) pairs in input order
+    """
+    index = defaultdict(list)
+    for position, vlan in enumerate(vlans):
+        index[_resolve_site_key(vlan.get("site"))].append((position, vlan))
+    return index
+
+
+def index_prefixes(
+    prefixes: List[Dict[str, Any]],
+) -> Tuple[Dict[Any, List[Tuple[int, int]]], Dict[int, List[int]]]:
+    """Index prefixes by direct site key and by VLAN ID in a single pass.
+
+    Prefixes without a VLAN ID are never selected for a site, so they are
+    left out of both indexes.
+
+    Args:
+        prefixes: List of all prefixes from NetBox
+
+    Returns:
+        Tuple of (site key -> [(position, VLAN ID)], VLAN ID -> [position])
+    """
+    by_site = defaultdict(list)
+    by_vlan_id = defaultdict(list)
+    for position, prefix in enumerate(prefixes):
+        vlan_id = extract_vlan_id_from_field(prefix.get("vlan"))
+        if vlan_id is None:
+            continue
+        prefix_site = prefix.get("site")
+        if prefix_site:
+            by_site[_resolve_site_key(prefix_site)].append((position, vlan_id))
+        by_vlan_id[vlan_id].append(position)
+    return by_site, by_vlan_id
+
+
+def select_site_vlans(
+    vlan_index: Dict[Any, List[Tuple[int, Dict[str, Any]]]],
+    site_slug: str,
+    site_name: str,
+) -> List[Dict[str, Any]]:
+    """Look up the VLANs assigned to a site by slug or name.
+
+    Args:
+        vlan_index: Index built by index_vlans_by_site
+        site_slug: Site slug
+        site_name: Site name
+
+    Returns:
+        VLANs for the site, in their original export order
+    """
+    matches = vlan_index.get(site_slug, [])
+    if site_name != site_slug:
+        matches = sorted(matches + vlan_index.get(site_name, []), key=itemgetter(0))
+    return [vlan for _, vlan in matches]
+
+
+def select_site_prefixes(
+    prefixes: List[Dict[str, Any]],
+    prefix_index: Tuple[Dict[Any, List[Tuple[int, int]]], Dict[int, List[int]]],
+    site_slug: str,
+    site_name: str,
+    site_vlan_ids: Set[int],
+) -> List[Dict[str, Any]]:
+    """Select one prefix per VLAN for a site.
+
+    A prefix belongs to the site if its direct site field matches the site
+    slug or name, or if its VLAN belongs to the site. When several prefixes
+    share a VLAN ID, the last one in export order wins.
+
+    Args:
+        prefixes: List of all prefixes from NetBox
+        prefix_index: Indexes built by index_prefixes
+        site_slug: Site slug
+        site_name: Site name
+        site_vlan_ids: VLAN IDs of the VLANs assigned to the site
+
+    Returns:
+        Prefixes for the site, deduplicated by VLAN ID
+    """
+    by_site, by_vlan_id = prefix_index
+    site_keys = {site_slug, site_name}
+    positions = {position for key in site_keys for position, _ in by_site.get(key, [])}
+    for vlan_id in site_vlan_ids:
+        positions.update(by_vlan_id.get(vlan_id, []))
+
+    # Deduplicate by VLAN ID, keeping the last prefix found
+    prefix_map = {}
+    for position in sorted(positions):
+        prefix = prefixes[position]
+        prefix_map[extract_vlan_id_from_field(prefix.get("vlan"))] = prefix
+    return list(prefix_map.values())
+
+
 def render_unifi_site(site: Dict[str, Any]) -> Dict[str, Any]:
     """Render UniFi site configuration from NetBox site data.
 
@@ -229,10 +358,8 @@ def render_unifi_site(site: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         UniFi site configuration dictionary
     """
-    return {
-        "name": site.get("name", ""),
-        "desc": site.get("description", site.get("name", "")),
-    }
+    name = site.get("name", "")
+    return {"name": name, "desc": site.get("description", name)}
 
 
 def render_unifi_networks(prefixes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -258,18 +385,16 @@ def render_unifi_networks(prefixes: List[Dict[str, Any]]) -> List[Dict[str, Any]
 
         # Basic network config
         network = {
-            "name": description if description else cidr,
+            "name": description or cidr,
             "purpose": "corporate",
             "ip_subnet": cidr,
             "enabled": status == "active",
+            "vlan_enabled": vlan_id is not None,
         }
 
         # Add VLAN if specified
         if vlan_id is not None:
             network["vlan"] = vlan_id
-            network["vlan_enabled"] = True
-        else:
-            network["vlan_enabled"] = False
 
         networks.append(network)
 
@@ -354,25 +479,67 @@ def render_site_unifi_config(
     return config
 
 
-def write_unifi_config_file(config: Dict[str, Any], output_path: Path) -> None:
-    """Write UniFi config data to a JSON file with deterministic formatting.
+def format_unifi_config(config: Dict[str, Any]) -> str:
+    """Serialize UniFi config data to JSON text with deterministic formatting.
 
     Uses sorted keys and consistent indentation for deterministic output.
 
+    Args:
+        config: UniFi configuration dictionary
+
+    Returns:
+        JSON text with a trailing newline
+    """
+    return json.dumps(config, indent=2, sort_keys=True) + "\n"
+
+
+def write_unifi_config_file(config: Dict[str, Any], output_path: Path) -> None:
+    """Write UniFi config data to a JSON file with deterministic formatting.
+
     Args:
         config: UniFi configuration dictionary
         output_path: Path to write the JSON file
     """
+    write_unifi_config_text(format_unifi_config(config), output_path)
+
+
+def write_unifi_config_text(content: str, output_path: Path) -> None:
+    """Write already-serialized UniFi config JSON text to a file.
+
+    Args:
+        content: JSON text produced by format_unifi_config
+        output_path: Path to write the JSON file
+    """
     try:
-        with open(output_path, "w") as f:
-            json.dump(config, f, indent=2, sort_keys=True)
-            f.write("\n")  # Add trailing newline
+        # The content is complete, so write it with unbuffered syscalls rather
+        # than through Python's text and buffered I/O layers
+        payload = memoryview(content.encode("utf-8"))
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            while payload:
+                payload = payload[os.write(fd, payload) :]
+        finally:
+            os.close(fd)
         print(f"✅ Generated: {output_path}")
     except Exception as e:
         print(f"❌ Error writing {output_path}: {e}")
         raise
 
 
+def render_site_unifi_config_text(task: Tuple[Any, ...]) -> str:
+    """Render and serialize the UniFi config for one site.
+
+    Module-level so it can be dispatched to ProcessPoolExecutor workers.
+
+    Args:
+        task: (site, prefixes, vlans) arguments for render_site_unifi_config
+
+    Returns:
+        JSON text produced by format_unifi_config
+    """
+    return format_unifi_config(render_site_unifi_config(*task))
+
+
 def main():
     """Main function to handle command-line arguments and render UniFi configs."""
     parser = argparse.ArgumentParser(
@@ -389,6 +556,9 @@ Examples:
   # Specify custom output directory
   python render_unifi.py --input-dir artifacts/intent-export --output-dir /tmp/unifi
 
+  # Render sites in parallel with 4 worker processes
+  python render_unifi.py --input-dir artifacts/intent-export --jobs 4
+
 NetBox to UniFi Mapping:
   Sites:      name → site.name, description → site.desc
   Prefixes:   prefix → network.ip_subnet, vlan → network.vlan,
@@ -430,6 +600,16 @@ Output Files:
         help="Output directory for UniFi config files (default: artifacts/unifi)",
     )
 
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes used to render site files "
+            "(default: 1, render serially)"
+        ),
+    )
+
     args = parser.parse_args()
 
     print("=" * 70)
@@ -469,84 +649,63 @@ Output Files:
     print("🔨 Generating UniFi configuration files...")
     print()
 
+    # Index VLANs and prefixes once, instead of re-scanning them per site
+    vlan_index = index_vlans_by_site(all_vlans)
+    prefix_index = index_prefixes(all_prefixes)
+
+    render_tasks = []
+    site_summaries = []
     generated_files = []
     for site in sites:
         site_slug = extract_site_slug(site)
         site_name = site.get("name", site_slug)
 
-        print(f"Processing site: {site_name} ({site_slug})")
-
-        # Filter VLANs for this site first
-        # VLANs have direct site association
-        site_vlans = []
-        site_vlan_ids = set()  # Track VLAN IDs for this site
-        for vlan in all_vlans:
-            vlan_site = vlan.get("site")
-            # Handle both string (minimal schema) and object (API export)
-            if isinstance(vlan_site, dict):
-                vlan_site_slug = vlan_site.get("slug", vlan_site.get("name"))
-            else:
-                vlan_site_slug = vlan_site
-
-            if vlan_site_slug == site_slug or vlan_site_slug == site_name:
-                site_vlans.append(vlan)
-                # Track VLAN ID for prefix matching using helper function
-                vlan_id = extract_vlan_id_from_field(vlan)
-                if vlan_id is not None:
-                    site_vlan_ids.add(vlan_id)
-
-        # Filter prefixes for this site using VLAN-based matching
-        # Prefixes may not have direct 'site' field in NetBox API exports
-        # Instead, match by VLAN association AND ensure one prefix per VLAN
-        # (deduplicating by VLAN ID, keeping the last one found)
-        prefix_map = {}  # vlan_id -> prefix (deduplicates)
-
-        for prefix in all_prefixes:
-            prefix_site = prefix.get("site")
-            prefix_vlan = prefix.get("vlan")
-
-            # Method 1: Direct site field (if present)
-            if prefix_site:
-                if isinstance(prefix_site, dict):
-                    prefix_site_slug = prefix_site.get("slug", prefix_site.get("name"))
-                else:
-                    prefix_site_slug = prefix_site
-
-                if prefix_site_slug == site_slug or prefix_site_slug == site_name:
-                    # Extract VLAN ID for deduplication using helper function
-                    vlan_id = extract_vlan_id_from_field(prefix_vlan)
-                    if vlan_id is not None:
-                        prefix_map[vlan_id] = prefix
-                    continue
-
-            # Method 2: Match by VLAN association (primary method for NetBox API)
-            if prefix_vlan is not None:
-                # Extract VLAN ID from prefix using helper function
-                prefix_vlan_id = extract_vlan_id_from_field(prefix_vlan)
-
-                # If this prefix's VLAN belongs to current site, include it
-                # Using dict ensures we keep only ONE prefix per VLAN (last one wins)
-                if prefix_vlan_id is not None and prefix_vlan_id in site_vlan_ids:
-                    prefix_map[prefix_vlan_id] = prefix
-
-        # Convert map back to list
-        site_prefixes = list(prefix_map.values())
-
-        print(f"  - {len(site_prefixes)} network(s) from prefixes")
-        print(f"  - {len(site_vlans)} VLAN(s)")
-        print("  - 0 WLAN(s) (placeholder)")
-
-        # Render UniFi config for this site
-        config = render_site_unifi_config(site, site_prefixes, site_vlans)
-
-        # Write to file
+        # Look up VLANs for this site (VLANs have direct site association)
+        site_vlans = select_site_vlans(vlan_index, site_slug, site_name)
+        site_vlan_ids = {
+            vlan_id
+            for vlan in site_vlans
+            if (vlan_id := extract_vlan_id_from_field(vlan)) is not None
+        }
+
+        # Look up prefixes by direct site field or VLAN association
+        # (prefixes may not have a 'site' field in NetBox API exports)
+        site_prefixes = select_site_prefixes(
+            all_prefixes, prefix_index, site_slug, site_name, site_vlan_ids
+        )
+
+        # Reported together with the site's "Generated" line once it is written
+        site_summaries.append(
+            [
+                f"Processing site: {site_name} ({site_slug})",
+                f"  - {len(site_prefixes)} network(s) from prefixes",
+                f"  - {len(site_vlans)} VLAN(s)",
+                "  - 0 WLAN(s) (placeholder)",
+            ]
+        )
+
+        render_tasks.append((site, site_prefixes, site_vlans))
+
         # If slug already starts with "site-", don't add it again
         if site_slug.startswith("site-"):
             output_file = args.output_dir / f"{site_slug}.json"
         else:
             output_file = args.output_dir / f"site-{site_slug}.json"
-        write_unifi_config_file(config, output_file)
         generated_files.append(output_file)
+
+    # Render sites (optionally in parallel); map() keeps the input order, so
+    # files are written and reported in the same order as the sites
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            contents = list(
+                executor.map(render_site_unifi_config_text, render_tasks, chunksize=4)
+            )
+    else:
+        contents = [render_site_unifi_config_text(task) for task in render_tasks]
+
+    for summary, content, output_file in zip(site_summaries, contents, generated_files):
+        print("\n".join(summary))
+        write_unifi_config_text(content, output_file)
         print()
 
     # Summary
@@ -21,13 +21,23 @@ Environment Variables:
 """
 
 import argparse
+import ipaddress
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    # PyYAML built without libyaml; use the pure-Python loader
+    from yaml import SafeLoader
 
 # Add the scripts directory to the path for imports
 SCRIPT_DIR = Path(__file__).parent
@@ -38,25 +48,140 @@ from nb_config import NETBOX_URL, TOKEN  # noqa: E402
 # API headers for authentication
 HEADERS = {"Authorization": f"Token {TOKEN}", "Content-Type": "application/json"}
 
+# Shared session so every request reuses pooled keep-alive connections.
+# Retries only apply to idempotent methods (GET), so a POST is never resent.
+# The pool size also caps the number of files seeded concurrently (--jobs).
+SESSION_POOL_SIZE = 16
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount(
+    NETBOX_URL,
+    HTTPAdapter(
+        pool_maxsize=SESSION_POOL_SIZE,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]
+        ),
+    ),
+)
+
+# Runs of characters that are not allowed in a NetBox slug
+SLUG_INVALID_CHARS = re.compile(r"[^a-z0-9]+")
+
+# Maximum number of values per multi-value existence-check query, which keeps
+# the request URL well below typical server limits
+EXISTENCE_CHECK_BATCH_SIZE = 100
+
+
+def normalize_prefix(prefix):
+    """Normalize a prefix string the way NetBox compares prefixes.
+
+    Args:
+        prefix: Prefix in CIDR notation (e.g., "192.168.10.0/24")
+
+    Returns:
+        Canonical network string, or the input unchanged if it is not a
+        valid network
+    """
+    try:
+        return str(ipaddress.ip_network(prefix, strict=False))
+    except ValueError:
+        return prefix
+
+
+def fetch_existing(endpoint, params, field, values, key=str):
+    """Fetch existing objects matching any of the given field values.
+
+    Uses NetBox multi-value filters (repeated query parameters), so a whole
+    batch of objects is checked with one request instead of one GET each.
+
+    Args:
+        endpoint: API endpoint relative to NETBOX_URL (e.g., "ipam/vlans/")
+        params: Additional filter parameters (e.g., {"site_id": 1})
+        field: Field to filter on (e.g., "vid")
+        values: Values of field to look up
+        key: Function mapping a field value to its lookup key
+
+    Returns:
+        Dictionary mapping key(value) to the first matching object
+
+    Raises:
+        requests.exceptions.RequestException: If an API request fails
+    """
+    existing = {}
+    values = list(dict.fromkeys(values))
+    for start in range(0, len(values), EXISTENCE_CHECK_BATCH_SIZE):
+        batch = values[start : start + EXISTENCE_CHECK_BATCH_SIZE]
+        url = f"{NETBOX_URL}{endpoint}"
+        query = {**params, field: batch, "limit": len(batch)}
+        while url:
+            response = SESSION.get(url, params=query)
+            response.raise_for_status()
+            page = response.json()
+            for obj in page["results"]:
+                existing.setdefault(key(obj[field]), obj)
+            # The "next" link already carries the query parameters
+            url = page.get("next")
+            query = None
+    return existing
+
+
+def create_objects(endpoint, payloads):
+    """Create objects with a single bulk POST.
+
+    NetBox creates a posted list in one transaction, so when the bulk request
+    is rejected with 400 nothing was created. The objects are then posted one
+    at a time so each error can be reported against the offending object.
+
+    Args:
+        endpoint: API endpoint relative to NETBOX_URL (e.g., "ipam/vlans/")
+        payloads: List of object payloads to create
+
+    Returns:
+        List aligned with payloads holding each created object, or the
+        RequestException raised while creating it
+    """
+    if not payloads:
+        return []
+
+    url = f"{NETBOX_URL}{endpoint}"
+    try:
+        response = SESSION.post(url, json=payloads)
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        if e.response is None or e.response.status_code != 400:
+            return [e] * len(payloads)
+
+    results = []
+    for payload in payloads:
+        try:
+            response = SESSION.post(url, json=payload)
+            response.raise_for_status()
+            results.append(response.json())
+        except requests.exceptions.RequestException as e:
+            results.append(e)
+    return results
+
 
-def seed_site(data, site_name):
+def seed_site(data, site_name, log=print):
     """Create a site in NetBox.
 
     Args:
         data: Dictionary containing site configuration
         site_name: Name of the site for logging purposes
+        log: Function called with each output line (default: print)
 
     Returns:
         Created site object or None if error
     """
     site_config = data.get("site", {})
     if not site_config:
-        print(f"⚠️  No site configuration found in {site_name}")
+        log(f"⚠️  No site configuration found in {site_name}")
         return None
 
     # Generate slug: convert to lowercase, replace non-alphanumeric
     # with hyphens, strip leading/trailing hyphens
-    default_slug = re.sub(r"[^a-z0-9]+", "-", site_config["name"].lower()).strip("-")
+    default_slug = SLUG_INVALID_CHARS.sub("-", site_config["name"].lower()).strip("-")
 
     site_payload = {
         "name": site_config["name"],
@@ -70,47 +195,61 @@ def seed_site(data, site_name):
         # Check if site already exists
         check_url = f"{NETBOX_URL}dcim/sites/"
         params = {"slug": site_payload["slug"]}
-        response = requests.get(check_url, headers=HEADERS, params=params)
+        response = SESSION.get(check_url, params=params)
         response.raise_for_status()
+        body = response.json()
 
-        if response.json()["count"] > 0:
-            site = response.json()["results"][0]
-            print(f"✅ Site '{site_config['name']}' already exists (ID: {site['id']})")
+        if body["count"] > 0:
+            site = body["results"][0]
+            log(f"✅ Site '{site_config['name']}' already exists (ID: {site['id']})")
             return site
 
         # Create new site
-        response = requests.post(
-            f"{NETBOX_URL}dcim/sites/", json=site_payload, headers=HEADERS
-        )
+        response = SESSION.post(f"{NETBOX_URL}dcim/sites/", json=site_payload)
         response.raise_for_status()
         site = response.json()
-        print(f"✅ Created site '{site_config['name']}' (ID: {site['id']})")
+        log(f"✅ Created site '{site_config['name']}' (ID: {site['id']})")
         return site
 
     except requests.exceptions.RequestException as e:
-        print(f"❌ Error creating site: {e}")
+        log(f"❌ Error creating site: {e}")
         if hasattr(e, "response") and e.response is not None:
-            print(f"   Response: {e.response.text}")
+            log(f"   Response: {e.response.text}")
         return None
 
 
-def seed_vlans(data, site_name, site_obj):
+def seed_vlans(data, site_name, site_obj, log=print):
     """Create VLANs in NetBox.
 
     Args:
         data: Dictionary containing VLAN configuration
         site_name: Name of the site for logging purposes
         site_obj: Site object to associate VLANs with
+        log: Function called with each output line (default: print)
 
     Returns:
         List of created VLAN objects
     """
     vlans_config = data.get("vlans", [])
     if not vlans_config:
-        print(f"ℹ️  No VLANs defined in {site_name}")
+        log(f"ℹ️  No VLANs defined in {site_name}")
         return []
 
-    created_vlans = []
+    # Look up all existing VLANs for this site up front
+    params = {"site_id": site_obj["id"]} if site_obj else {}
+    try:
+        existing_vlans = fetch_existing(
+            "ipam/vlans/", params, "vid", [v["vlan_id"] for v in vlans_config]
+        )
+    except requests.exceptions.RequestException as e:
+        log(f"❌ Error checking existing VLANs: {e}")
+        if hasattr(e, "response") and e.response is not None:
+            log(f"   Response: {e.response.text}")
+        return []
+
+    # Build payloads and collect the VLANs that still need to be created
+    vlan_keys = []
+    pending_vlans = {}
     for vlan_config in vlans_config:
         vlan_payload = {
             "vid": vlan_config["vlan_id"],
@@ -124,46 +263,45 @@ def seed_vlans(data, site_name, site_obj):
         if site_obj:
             vlan_payload["site"] = site_obj["id"]
 
-        try:
-            # Check if VLAN already exists
-            check_url = f"{NETBOX_URL}ipam/vlans/"
-            params = {"vid": vlan_payload["vid"]}
-            if site_obj:
-                params["site_id"] = site_obj["id"]
-            response = requests.get(check_url, headers=HEADERS, params=params)
-            response.raise_for_status()
+        vlan_key = str(vlan_payload["vid"])
+        vlan_keys.append(vlan_key)
+        if vlan_key not in existing_vlans:
+            pending_vlans.setdefault(vlan_key, vlan_payload)
 
-            if response.json()["count"] > 0:
-                vlan = response.json()["results"][0]
-                vlan_id = vlan_config["vlan_id"]
-                vlan_name = vlan_config["name"]
-                print(
-                    f"✅ VLAN {vlan_id} ('{vlan_name}') "
-                    f"already exists (ID: {vlan['id']})"
-                )
-                created_vlans.append(vlan)
-                continue
+    # Create all new VLANs with a single bulk request
+    results = dict(
+        zip(pending_vlans, create_objects("ipam/vlans/", list(pending_vlans.values())))
+    )
 
-            # Create new VLAN
-            response = requests.post(
-                f"{NETBOX_URL}ipam/vlans/", json=vlan_payload, headers=HEADERS
+    created_vlans = []
+    for vlan_config, vlan_key in zip(vlans_config, vlan_keys):
+        vlan_id = vlan_config["vlan_id"]
+        vlan_name = vlan_config["name"]
+        result = results.pop(vlan_key, None)
+
+        if result is None:
+            vlan = existing_vlans.get(vlan_key)
+            if vlan is None:
+                # Creating an earlier entry for this VLAN failed (already reported)
+                continue
+            log(
+                f"✅ VLAN {vlan_id} ('{vlan_name}') "
+                f"already exists (ID: {vlan['id']})"
             )
-            response.raise_for_status()
-            vlan = response.json()
-            vlan_id = vlan_config["vlan_id"]
-            vlan_name = vlan_config["name"]
-            print(f"✅ Created VLAN {vlan_id} ('{vlan_name}') " f"(ID: {vlan['id']})")
             created_vlans.append(vlan)
-
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error creating VLAN {vlan_config['vlan_id']}: {e}")
-            if hasattr(e, "response") and e.response is not None:
-                print(f"   Response: {e.response.text}")
+        elif isinstance(result, requests.exceptions.RequestException):
+            log(f"❌ Error creating VLAN {vlan_id}: {result}")
+            if result.response is not None:
+                log(f"   Response: {result.response.text}")
+        else:
+            log(f"✅ Created VLAN {vlan_id} ('{vlan_name}') " f"(ID: {result['id']})")
+            created_vlans.append(result)
+            existing_vlans[vlan_key] = result
 
     return created_vlans
 
 
-def seed_prefixes(data, site_name, site_obj, vlans):
+def seed_prefixes(data, site_name, site_obj, vlans, log=print):
     """Create IP prefixes in NetBox.
 
     Args:
@@ -171,19 +309,37 @@ def seed_prefixes(data, site_name, site_obj, vlans):
         site_name: Name of the site for logging purposes
         site_obj: Site object to associate prefixes with
         vlans: List of VLAN objects to associate with prefixes
+        log: Function called with each output line (default: print)
 
     Returns:
         List of created prefix objects
     """
     prefixes_config = data.get("prefixes", [])
     if not prefixes_config:
-        print(f"ℹ️  No prefixes defined in {site_name}")
+        log(f"ℹ️  No prefixes defined in {site_name}")
         return []
 
     # Create a mapping of VLAN IDs to VLAN objects
     vlan_map = {vlan["vid"]: vlan for vlan in vlans}
 
-    created_prefixes = []
+    # Look up all existing prefixes up front
+    try:
+        existing_prefixes = fetch_existing(
+            "ipam/prefixes/",
+            {},
+            "prefix",
+            [p["prefix"] for p in prefixes_config],
+            key=normalize_prefix,
+        )
+    except requests.exceptions.RequestException as e:
+        log(f"❌ Error checking existing prefixes: {e}")
+        if hasattr(e, "response") and e.response is not None:
+            log(f"   Response: {e.response.text}")
+        return []
+
+    # Build payloads and collect the prefixes that still need to be created
+    prefix_keys = []
+    pending_prefixes = {}
     for prefix_config in prefixes_config:
         prefix_payload = {
             "prefix": prefix_config["prefix"],
@@ -200,90 +356,120 @@ def seed_prefixes(data, site_name, site_obj, vlans):
         if "vlan" in prefix_config and prefix_config["vlan"] in vlan_map:
             prefix_payload["vlan"] = vlan_map[prefix_config["vlan"]]["id"]
 
-        try:
-            # Check if prefix already exists
-            check_url = f"{NETBOX_URL}ipam/prefixes/"
-            params = {"prefix": prefix_payload["prefix"]}
-            response = requests.get(check_url, headers=HEADERS, params=params)
-            response.raise_for_status()
+        prefix_key = normalize_prefix(prefix_payload["prefix"])
+        prefix_keys.append(prefix_key)
+        if prefix_key not in existing_prefixes:
+            pending_prefixes.setdefault(prefix_key, prefix_payload)
 
-            if response.json()["count"] > 0:
-                prefix = response.json()["results"][0]
-                prefix_addr = prefix_config["prefix"]
-                print(
-                    f"✅ Prefix {prefix_addr} already exists " f"(ID: {prefix['id']})"
-                )
-                created_prefixes.append(prefix)
-                continue
+    # Create all new prefixes with a single bulk request
+    results = dict(
+        zip(
+            pending_prefixes,
+            create_objects("ipam/prefixes/", list(pending_prefixes.values())),
+        )
+    )
 
-            # Create new prefix
-            response = requests.post(
-                f"{NETBOX_URL}ipam/prefixes/",
-                json=prefix_payload,
-                headers=HEADERS,
-            )
-            response.raise_for_status()
-            prefix = response.json()
-            prefix_addr = prefix_config["prefix"]
-            print(f"✅ Created prefix {prefix_addr} " f"(ID: {prefix['id']})")
+    created_prefixes = []
+    for prefix_config, prefix_key in zip(prefixes_config, prefix_keys):
+        prefix_addr = prefix_config["prefix"]
+        result = results.pop(prefix_key, None)
+
+        if result is None:
+            prefix = existing_prefixes.get(prefix_key)
+            if prefix is None:
+                # Creating an earlier entry for this prefix failed (already reported)
+                continue
+            log(f"✅ Prefix {prefix_addr} already exists " f"(ID: {prefix['id']})")
             created_prefixes.append(prefix)
-
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error creating prefix {prefix_config['prefix']}: {e}")
-            if hasattr(e, "response") and e.response is not None:
-                print(f"   Response: {e.response.text}")
+        elif isinstance(result, requests.exceptions.RequestException):
+            log(f"❌ Error creating prefix {prefix_addr}: {result}")
+            if result.response is not None:
+                log(f"   Response: {result.response.text}")
+        else:
+            log(f"✅ Created prefix {prefix_addr} " f"(ID: {result['id']})")
+            created_prefixes.append(result)
+            existing_prefixes[prefix_key] = result
 
     return created_prefixes
 
 
-def seed_from_file(file_path):
+def seed_from_file(file_path, log=print):
     """Seed NetBox with data from a YAML file.
 
     Args:
         file_path: Path to the YAML file containing site configuration
+        log: Function called with each output line (default: print)
 
     Returns:
         True if successful, False otherwise
     """
-    print(f"\n{'=' * 60}")
-    print(f"Processing: {file_path}")
-    print("=" * 60)
+    log(f"\n{'=' * 60}")
+    log(f"Processing: {file_path}")
+    log("=" * 60)
 
     try:
         with open(file_path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
 
         if not data:
-            print(f"⚠️  Empty or invalid YAML file: {file_path}")
+            log(f"⚠️  Empty or invalid YAML file: {file_path}")
             return False
 
         # Seed in order: site -> vlans -> prefixes
-        site = seed_site(data, file_path)
+        site = seed_site(data, file_path, log)
         if not site:
-            print("⚠️  Skipping VLANs and prefixes " "due to site creation failure")
+            log("⚠️  Skipping VLANs and prefixes " "due to site creation failure")
             return False
 
-        vlans = seed_vlans(data, file_path, site)
-        prefixes = seed_prefixes(data, file_path, site, vlans)
+        vlans = seed_vlans(data, file_path, site, log)
+        prefixes = seed_prefixes(data, file_path, site, vlans, log)
 
-        print(f"\n✅ Successfully processed {file_path}")
+        log(f"\n✅ Successfully processed {file_path}")
         site_summary = (
             f"Site={site['name']}, " f"VLANs={len(vlans)}, " f"Prefixes={len(prefixes)}"
         )
-        print(f"   Summary: {site_summary}")
+        log(f"   Summary: {site_summary}")
         return True
 
     except FileNotFoundError:
-        print(f"❌ File not found: {file_path}")
+        log(f"❌ File not found: {file_path}")
         return False
     except yaml.YAMLError as e:
-        print(f"❌ Error parsing YAML file: {e}")
+        log(f"❌ Error parsing YAML file: {e}")
         return False
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        log(f"❌ Unexpected error: {e}")
         return False
 
 
+def seed_files_concurrently(files, jobs):
+    """Seed several YAML files concurrently using a thread pool.
+
+    Each worker collects its file's output lines instead of printing them,
+    and the main thread prints each file's lines as a block, in the order the
+    files were given, so logs read the same as a sequential run.
+
+    Args:
+        files: Paths to the YAML files containing site configuration
+        jobs: Maximum number of files to seed at the same time
+
+    Yields:
+        True or False for each file, as returned by seed_from_file
+    """
+
+    def seed_collected(file_path):
+        lines = []
+        success = seed_from_file(file_path, log=lines.append)
+        return success, lines
+
+    max_workers = min(jobs, len(files), SESSION_POOL_SIZE)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for success, lines in executor.map(seed_collected, files):
+            for line in lines:
+                print(line)
+            yield success
+
+
 def main():
     """Main function to handle command-line arguments and seed NetBox."""
     parser = argparse.ArgumentParser(
@@ -300,6 +486,9 @@ Examples:
   # Seed all sites in examples directory
   python seed_netbox.py examples/*.yaml
 
+  # Seed up to 4 site files at the same time
+  python seed_netbox.py --jobs 4 examples/*.yaml
+
 Environment Variables:
   NETBOX_URL         NetBox API URL (default: http://localhost:8000/api/)
   NETBOX_API_TOKEN   NetBox API token (required)
@@ -312,6 +501,16 @@ Environment Variables:
         help="YAML file(s) containing site configuration",
     )
 
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of files to seed concurrently (default: 1). Each file "
+            "must describe a different site"
+        ),
+    )
+
     args = parser.parse_args()
 
     # Sanitize URL for display (remove any potential credentials)
@@ -328,8 +527,13 @@ Environment Variables:
     success_count = 0
     fail_count = 0
 
-    for file_path in args.files:
-        if seed_from_file(file_path):
+    if args.jobs > 1:
+        results = seed_files_concurrently(args.files, args.jobs)
+    else:
+        results = map(seed_from_file, args.files)
+
+    for success in results:
+        if success:
             success_count += 1
         else:
             fail_count += 1
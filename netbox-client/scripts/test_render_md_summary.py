@@ -8,6 +8,7 @@ to ensure correct output format and content.
 import sys
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
 
 # Add scripts directory to path for imports
 # This allows importing render_md_summary module for testing without
@@ -16,6 +17,49 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 import render_md_summary  # noqa: E402
 
+# Shared read-only fixture data for site-pennington. The renderers only read
+# their inputs, so the same objects are safely reused by every test.
+SITE_PENNINGTON = MappingProxyType(
+    {
+        "name": "site-pennington",
+        "slug": "site-pennington",
+        "description": "Primary residence",
+    }
+)
+
+HOME_LAN_PREFIXES = (
+    MappingProxyType(
+        {
+            "prefix": "192.168.10.0/24",
+            "vlan": 10,
+            "description": "Home LAN",
+            "status": "active",
+        }
+    ),
+)
+
+HOME_LAN_VLANS = (
+    MappingProxyType(
+        {
+            "vlan_id": 10,
+            "name": "Home LAN",
+            "description": "Default VLAN",
+            "status": "active",
+        }
+    ),
+)
+
+HOME_NETWORK_TAGS = (
+    MappingProxyType(
+        {
+            "name": "home-network",
+            "slug": "home-network",
+            "description": "Home network tag",
+            "color": "2196f3",
+        }
+    ),
+)
+
 
 def test_extract_site_slug():
     """Test site slug extraction logic."""
@@ -36,79 +80,25 @@ def test_extract_site_slug():
 
 def test_generate_mermaid_topology():
     """Test Mermaid topology diagram generation."""
-    site = {
-        "name": "site-pennington",
-        "slug": "site-pennington",
-        "description": "Test site",
-    }
-
-    prefixes = [
-        {
-            "prefix": "192.168.10.0/24",
-            "vlan": 10,
-            "description": "Home LAN",
-            "status": "active",
-        }
-    ]
-
-    vlans = [
-        {
-            "vlan_id": 10,
-            "name": "Home LAN",
-            "description": "Default VLAN",
-            "status": "active",
-        }
-    ]
-
-    result = render_md_summary.generate_mermaid_topology(site, prefixes, vlans)
+    result = render_md_summary.generate_mermaid_topology(
+        SITE_PENNINGTON, HOME_LAN_PREFIXES, HOME_LAN_VLANS
+    )
 
     # Validate structure
-    assert "```mermaid" in result
-    assert "graph TD" in result
+    assert result.startswith("```mermaid\ngraph TD\n")
     assert "site-pennington" in result
     assert "VLAN10" in result
     assert "192.168.10.0/24" in result
-    assert "```" in result.split("\n")[-1]
+    assert result.endswith("\n```")
 
     print("✅ test_generate_mermaid_topology passed")
 
 
 def test_render_site_markdown():
     """Test Markdown rendering for a single site."""
-    site = {
-        "name": "site-pennington",
-        "slug": "site-pennington",
-        "description": "Primary residence",
-    }
-
-    prefixes = [
-        {
-            "prefix": "192.168.10.0/24",
-            "vlan": 10,
-            "description": "Home LAN",
-            "status": "active",
-        }
-    ]
-
-    vlans = [
-        {
-            "vlan_id": 10,
-            "name": "Home LAN",
-            "description": "Default VLAN",
-            "status": "active",
-        }
-    ]
-
-    tags = [
-        {
-            "name": "home-network",
-            "slug": "home-network",
-            "description": "Home network tag",
-            "color": "2196f3",
-        }
-    ]
-
-    result = render_md_summary.render_site_markdown(site, prefixes, vlans, tags)
+    result = render_md_summary.render_site_markdown(
+        SITE_PENNINGTON, HOME_LAN_PREFIXES, HOME_LAN_VLANS, HOME_NETWORK_TAGS
+    )
 
     # Validate structure
     assert "# Network Summary: site-pennington" in result
@@ -183,13 +173,10 @@ def test_render_site_markdown_prefix_without_vlan():
     assert "10.0.0.0/8" in result
     assert "Untagged prefix" in result
     # Check that the VLAN column shows a placeholder
-    lines = result.split("\n")
     # Find the table line (starts with |), not the mermaid diagram line
-    prefix_lines = [
-        line for line in lines if "10.0.0.0/8" in line and line.startswith("|")
-    ]
-    assert len(prefix_lines) > 0, "Expected to find prefix in table"
-    prefix_line = prefix_lines[0]
+    row_start = result.find("\n| 10.0.0.0/8 |")
+    assert row_start != -1, "Expected to find prefix in table"
+    prefix_line = result[row_start + 1 : result.find("\n", row_start + 1)]
     # Should have — or similar for empty VLAN
     assert "—" in prefix_line or "N/A" in prefix_line
 
@@ -211,9 +198,7 @@ def test_write_and_read_markdown_file():
         assert output_file.exists()
 
         # Verify content
-        with open(output_file, "r") as f:
-            read_content = f.read()
-        assert read_content == content
+        assert output_file.read_text() == content
 
     print("✅ test_write_and_read_markdown_file passed")
 
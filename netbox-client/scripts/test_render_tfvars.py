@@ -9,6 +9,7 @@ import json
 import sys
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
 
 # Add parent directory to path for imports
 # This allows importing render_tfvars module for testing without
@@ -18,6 +19,74 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 import render_tfvars  # noqa: E402
 
+# Shared read-only fixture data. The renderers only read their inputs, so the
+# same objects are safely reused by every test that needs them.
+SITE_PENNINGTON = MappingProxyType(
+    {
+        "name": "site-pennington",
+        "slug": "site-pennington",
+        "description": "Primary residence",
+    }
+)
+
+HOME_LAN_PREFIXES = (
+    MappingProxyType(
+        {
+            "prefix": "192.168.10.0/24",
+            "vlan": 10,
+            "description": "Home LAN",
+            "status": "active",
+        }
+    ),
+)
+
+HOME_LAN_VLANS = (
+    MappingProxyType(
+        {
+            "vlan_id": 10,
+            "name": "Home LAN",
+            "description": "Default VLAN",
+            "status": "active",
+        }
+    ),
+)
+
+HOME_NETWORK_TAGS = (
+    MappingProxyType(
+        {
+            "name": "home-network",
+            "slug": "home-network",
+            "description": "Home network tag",
+            "color": "2196f3",
+        }
+    ),
+)
+
+TEST_SITE = MappingProxyType(
+    {"name": "test-site", "slug": "test-site", "description": "Test"}
+)
+TEST_PREFIXES = (
+    MappingProxyType({"prefix": "10.0.0.0/24", "vlan": 1, "description": "Test"}),
+)
+TEST_VLANS = (
+    MappingProxyType({"vlan_id": 1, "name": "Test VLAN", "description": "Test"}),
+)
+TEST_TAGS = (MappingProxyType({"name": "test", "slug": "test", "description": "Test"}),)
+
+# Minimal NetBox export used by the loader tests, serialized once both as a
+# consolidated file and as one file per resource type
+NETBOX_EXPORT = {
+    "sites": [{"name": "test-site", "slug": "test-site"}],
+    "prefixes": [{"site": "test-site", "prefix": "10.0.0.0/24"}],
+    "vlans": [{"site": "test-site", "vlan_id": 1, "name": "Test"}],
+    "tags": [{"name": "test", "slug": "test"}],
+}
+NETBOX_EXPORT_JSON = json.dumps(NETBOX_EXPORT)
+NETBOX_EXPORT_FILES_JSON = {
+    resource_name: json.dumps(records)
+    for resource_name, records in NETBOX_EXPORT.items()
+}
+
 
 def test_extract_status_value():
     """Test status value extraction from NetBox format."""
@@ -130,42 +199,33 @@ def test_extract_site_slug():
     print("✅ test_extract_site_slug passed")
 
 
-def test_render_site_tfvars():
-    """Test tfvars rendering for a single site."""
-    site = {
-        "name": "site-pennington",
-        "slug": "site-pennington",
-        "description": "Primary residence",
-    }
+def test_extract_site_from_vlan():
+    """Test VLAN site resolution shared by VLAN and prefix site matching."""
+    # Nested site object prefers slug, then name
+    vlan = {"site": {"slug": "site-pennington", "name": "Pennington"}}
+    assert render_tfvars.extract_site_from_vlan(vlan) == "site-pennington"
+    vlan = {"site": {"name": "Pennington"}}
+    assert render_tfvars.extract_site_from_vlan(vlan) == "Pennington"
 
-    prefixes = [
-        {
-            "prefix": "192.168.10.0/24",
-            "vlan": 10,
-            "description": "Home LAN",
-            "status": "active",
-        }
-    ]
+    # Minimal schema uses a plain string
+    assert render_tfvars.extract_site_from_vlan({"site": "site-a"}) == "site-a"
 
-    vlans = [
-        {
-            "vlan_id": 10,
-            "name": "Home LAN",
-            "description": "Default VLAN",
-            "status": "active",
-        }
-    ]
+    # Missing or unusable site references resolve to None
+    assert render_tfvars.extract_site_from_vlan({}) is None
+    assert render_tfvars.extract_site_from_vlan({"site": 7}) is None
 
-    tags = [
-        {
-            "name": "home-network",
-            "slug": "home-network",
-            "description": "Home network tag",
-            "color": "2196f3",
-        }
-    ]
+    # VLAN indexing uses the same resolution
+    index = render_tfvars.index_resources_by_site([{"vid": 10, "site": 7}], "vlan")
+    assert [v["vid"] for _, v in index[None]] == [10]
+
+    print("✅ test_extract_site_from_vlan passed")
 
-    result = render_tfvars.render_site_tfvars(site, prefixes, vlans, tags)
+
+def test_render_site_tfvars():
+    """Test tfvars rendering for a single site."""
+    result = render_tfvars.render_site_tfvars(
+        SITE_PENNINGTON, HOME_LAN_PREFIXES, HOME_LAN_VLANS, HOME_NETWORK_TAGS
+    )
 
     # Validate structure
     assert "site_name" in result
@@ -273,24 +333,46 @@ def test_render_site_tfvars_with_null_vlan_id():
     print("✅ test_render_site_tfvars_with_null_vlan_id passed")
 
 
+def test_render_site_tfvars_with_rendered_tags():
+    """Test that pre-rendered tags are reused as-is for each site."""
+    site = {"name": "test-site", "slug": "test-site"}
+    tags = [{"name": "home-network", "color": "2196f3"}]
+
+    rendered_tags = render_tfvars.render_tags(tags)
+    assert rendered_tags == [
+        {
+            "name": "home-network",
+            "slug": "home-network",
+            "description": "",
+            "color": "2196f3",
+        }
+    ]
+
+    result = render_tfvars.render_site_tfvars(
+        site, [], [], tags, rendered_tags=rendered_tags
+    )
+    assert result["tags"] is rendered_tags
+    assert result == render_tfvars.render_site_tfvars(site, [], [], tags)
+
+    print("✅ test_render_site_tfvars_with_rendered_tags passed")
+
+
 def test_deterministic_output():
     """Test that the same input produces the same output (determinism)."""
-    # Create test data
-    site = {"name": "test-site", "slug": "test-site", "description": "Test"}
-    prefixes = [{"prefix": "10.0.0.0/24", "vlan": 1, "description": "Test"}]
-    vlans = [{"vlan_id": 1, "name": "Test VLAN", "description": "Test"}]
-    tags = [{"name": "test", "slug": "test", "description": "Test"}]
-
-    # Generate tfvars multiple times
-    results = []
-    for _ in range(3):
-        result = render_tfvars.render_site_tfvars(site, prefixes, vlans, tags)
-        # Convert to JSON string with sorted keys
-        json_str = json.dumps(result, indent=2, sort_keys=True)
-        results.append(json_str)
-
-    # All results should be identical
-    assert all(r == results[0] for r in results), "Output is not deterministic!"
+    # Render once from the shared fixtures and once from fresh copies of them;
+    # sorted-key JSON of equal dicts is identical, so comparing the dicts
+    # directly is sufficient
+    first = render_tfvars.render_site_tfvars(
+        TEST_SITE, TEST_PREFIXES, TEST_VLANS, TEST_TAGS
+    )
+    second = render_tfvars.render_site_tfvars(
+        dict(TEST_SITE),
+        [dict(p) for p in TEST_PREFIXES],
+        [dict(v) for v in TEST_VLANS],
+        [dict(t) for t in TEST_TAGS],
+    )
+
+    assert first == second, "Output is not deterministic!"
 
     print("✅ test_deterministic_output passed")
 
@@ -315,36 +397,48 @@ def test_write_and_read_tfvars():
         # Verify file exists
         assert output_path.exists(), "Output file was not created"
 
-        # Read and parse the file
-        with open(output_path, "r") as f:
-            loaded_data = json.load(f)
+        # Read the file once and parse it
+        content = output_path.read_text()
+        loaded_data = json.loads(content)
 
         # Verify data matches
         assert loaded_data == test_tfvars, "Written data does not match input"
 
         # Verify file has trailing newline
-        with open(output_path, "r") as f:
-            content = f.read()
         assert content.endswith("\n"), "File should end with newline"
 
     print("✅ test_write_and_read_tfvars passed")
 
 
+def test_render_site_tfvars_text():
+    """Test per-site render job output matches write_tfvars_file formatting."""
+    fixtures = (TEST_SITE, TEST_PREFIXES, TEST_VLANS, TEST_TAGS)
+
+    content = render_tfvars.render_site_tfvars_text((*fixtures, None))
+    expected = render_tfvars.render_site_tfvars(*fixtures)
+
+    assert content == json.dumps(expected, indent=2, sort_keys=True) + "\n"
+
+    # main() sends pre-rendered tags without the raw tag list
+    rendered_tags = render_tfvars.render_tags(TEST_TAGS)
+    task = (TEST_SITE, TEST_PREFIXES, TEST_VLANS, None, rendered_tags)
+    assert render_tfvars.render_site_tfvars_text(task) == content
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "test.tfvars.json"
+        render_tfvars.write_tfvars_file(expected, output_path)
+        assert output_path.read_text() == content
+
+    print("✅ test_render_site_tfvars_text passed")
+
+
 def test_load_netbox_export_from_file():
     """Test loading NetBox export from a single consolidated file."""
-    test_data = {
-        "sites": [{"name": "test-site", "slug": "test-site"}],
-        "prefixes": [{"site": "test-site", "prefix": "10.0.0.0/24"}],
-        "vlans": [{"site": "test-site", "vlan_id": 1, "name": "Test"}],
-        "tags": [{"name": "test", "slug": "test"}],
-    }
-
     with tempfile.TemporaryDirectory() as tmpdir:
         input_file = Path(tmpdir) / "test-input.json"
 
         # Write test input file
-        with open(input_file, "w") as f:
-            json.dump(test_data, f)
+        input_file.write_text(NETBOX_EXPORT_JSON)
 
         # Load using the function
         result = render_tfvars.load_netbox_export(input_file=input_file)
@@ -365,17 +459,8 @@ def test_load_netbox_export_from_directory():
         input_dir = Path(tmpdir)
 
         # Create separate files
-        with open(input_dir / "sites.json", "w") as f:
-            json.dump([{"name": "test-site", "slug": "test-site"}], f)
-
-        with open(input_dir / "prefixes.json", "w") as f:
-            json.dump([{"site": "test-site", "prefix": "10.0.0.0/24"}], f)
-
-        with open(input_dir / "vlans.json", "w") as f:
-            json.dump([{"site": "test-site", "vlan_id": 1, "name": "Test"}], f)
-
-        with open(input_dir / "tags.json", "w") as f:
-            json.dump([{"name": "test", "slug": "test"}], f)
+        for resource_name, payload in NETBOX_EXPORT_FILES_JSON.items():
+            (input_dir / f"{resource_name}.json").write_text(payload)
 
         # Load using the function
         result = render_tfvars.load_netbox_export(input_dir=input_dir)
@@ -389,26 +474,69 @@ def test_load_netbox_export_from_directory():
     print("✅ test_load_netbox_export_from_directory passed")
 
 
+def test_load_json_file_accepts_standard_json_extensions():
+    """Test that inputs parse exactly as the standard library json module does."""
+    # NaN and integers wider than 64 bits are accepted by json.loads
+    text = '{"sites": [{"name": "s", "latitude": NaN, "id": 18446744073709551616}]}'
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_file = Path(tmpdir) / "input.json"
+        input_file.write_text(text)
+        result = render_tfvars.load_json_file(input_file)
+
+    site = result["sites"][0]
+    assert site["latitude"] != site["latitude"]
+    assert site["id"] == 2**64
+
+    print("✅ test_load_json_file_accepts_standard_json_extensions passed")
+
+
 def test_json_keys_are_sorted():
     """Test that JSON output has sorted keys for determinism."""
     site = {"name": "zzz-site", "slug": "aaa-slug", "description": "mmm-desc"}
-    prefixes = []
-    vlans = []
-    tags = []
 
-    result = render_tfvars.render_site_tfvars(site, prefixes, vlans, tags)
-    json_str = json.dumps(result, indent=2, sort_keys=True)
+    result = render_tfvars.render_site_tfvars(
+        site, TEST_PREFIXES, TEST_VLANS, TEST_TAGS
+    )
+    # Serialize the way render_site_tfvars_text does, relying on presorted keys
+    json_str = render_tfvars.format_tfvars(result, presorted=True)
 
-    # Parse back to verify key order
-    lines = [line.strip() for line in json_str.split("\n") if ":" in line]
-    keys = [line.split(":")[0].strip('"') for line in lines]
+    # Parse back, checking the key order of every object as it is decoded
+    def check_pairs(pairs):
+        keys = [key for key, _ in pairs]
+        assert keys == sorted(keys), f"Keys are not sorted: {keys}"
+        return dict(pairs)
 
-    # Check that keys are in sorted order
-    assert keys == sorted(keys), f"Keys are not sorted: {keys}"
+    assert json.loads(json_str, object_pairs_hook=check_pairs) == result
 
     print("✅ test_json_keys_are_sorted passed")
 
 
+def test_render_site_tfvars_keys_in_canonical_order():
+    """Test that rendered dictionaries are built with keys already sorted."""
+    site = {"name": "zzz-site", "slug": "aaa-slug", "description": "mmm-desc"}
+
+    result = render_tfvars.render_site_tfvars(
+        site, TEST_PREFIXES, TEST_VLANS, TEST_TAGS
+    )
+
+    def assert_keys_sorted(value):
+        if isinstance(value, dict):
+            assert list(value) == sorted(value), f"Keys are not sorted: {list(value)}"
+            for item in value.values():
+                assert_keys_sorted(item)
+        elif isinstance(value, list):
+            for item in value:
+                assert_keys_sorted(item)
+
+    assert_keys_sorted(result)
+    assert render_tfvars.format_tfvars(
+        result, presorted=True
+    ) == render_tfvars.format_tfvars(result)
+
+    print("✅ test_render_site_tfvars_keys_in_canonical_order passed")
+
+
 def test_build_vlan_site_mapping():
     """Test VLAN to site mapping construction using composite keys."""
     vlans = [
@@ -420,15 +548,12 @@ def test_build_vlan_site_mapping():
 
     mapping = render_tfvars.build_vlan_site_mapping(vlans)
 
-    # Should use composite keys (site_slug, vid)
-    assert ("site-a", 10) in mapping
-    assert ("site-b", 20) in mapping
-    assert ("site-a", 30) in mapping
-    assert mapping[("site-a", 10)] == "site-a"
-    assert mapping[("site-b", 20)] == "site-b"
-    assert mapping[("site-a", 30)] == "site-a"
-    # VLAN without site should not be in mapping
-    assert ("site-a", 40) not in mapping
+    # Should use composite keys (site_slug, vid); VLAN without site is skipped
+    assert mapping == {
+        ("site-a", 10): "site-a",
+        ("site-b", 20): "site-b",
+        ("site-a", 30): "site-a",
+    }
 
     print("✅ test_build_vlan_site_mapping passed")
 
@@ -444,12 +569,8 @@ def test_build_vlan_id_to_site_mapping():
 
     mapping = render_tfvars.build_vlan_id_to_site_mapping(vlans)
 
-    # Should map internal IDs to sites
-    assert mapping[180] == "pennington"
-    assert mapping[187] == "countfleetcourt"
-    assert mapping[190] == "pennington"
-    # VLAN without ID should not be in mapping
-    assert 30 not in mapping
+    # Should map internal IDs to sites; VLAN without ID is skipped
+    assert mapping == {180: "pennington", 187: "countfleetcourt", 190: "pennington"}
 
     print("✅ test_build_vlan_id_to_site_mapping passed")
 
@@ -540,8 +661,7 @@ def test_filter_resources_by_site_prefixes():
         prefixes, "site-a", "Site A", "prefix", vlan_mapping, vlan_id_to_site
     )
 
-    assert len(filtered) == 1
-    assert filtered[0]["prefix"] == "10.1.0.0/24"
+    assert [p["prefix"] for p in filtered] == ["10.1.0.0/24"]
 
     print("✅ test_filter_resources_by_site_prefixes passed")
 
@@ -556,9 +676,7 @@ def test_filter_resources_by_site_vlans():
 
     filtered = render_tfvars.filter_resources_by_site(vlans, "site-a", "Site A", "vlan")
 
-    assert len(filtered) == 2
-    assert filtered[0]["vid"] == 10
-    assert filtered[1]["vid"] == 30
+    assert [v["vid"] for v in filtered] == [10, 30]
 
     print("✅ test_filter_resources_by_site_vlans passed")
 
@@ -596,8 +714,7 @@ def test_end_to_end_with_netbox_api_format():
     with tempfile.TemporaryDirectory() as tmpdir:
         input_file = Path(tmpdir) / "input.json"
 
-        with open(input_file, "w") as f:
-            json.dump(test_data, f)
+        input_file.write_text(json.dumps(test_data))
 
         # Load data
         loaded_data = render_tfvars.load_netbox_export(input_file=input_file)
@@ -639,8 +756,7 @@ def test_backward_compatibility_minimal_schema():
     with tempfile.TemporaryDirectory() as tmpdir:
         input_file = Path(tmpdir) / "input.json"
 
-        with open(input_file, "w") as f:
-            json.dump(test_data, f)
+        input_file.write_text(json.dumps(test_data))
 
         # Load data
         loaded_data = render_tfvars.load_netbox_export(input_file=input_file)
@@ -692,8 +808,7 @@ def test_vlans_without_prefixes_filtered():
     with tempfile.TemporaryDirectory() as tmpdir:
         input_file = Path(tmpdir) / "input.json"
 
-        with open(input_file, "w") as f:
-            json.dump(test_data, f)
+        input_file.write_text(json.dumps(test_data))
 
         # Load data
         loaded_data = render_tfvars.load_netbox_export(input_file=input_file)
@@ -719,9 +834,9 @@ def test_vlans_without_prefixes_filtered():
 
         # Filter VLANs to only those with prefixes (simulating main() logic)
         prefix_vlan_ids = {
-            render_tfvars.extract_vlan_association(p)
+            vlan_vid
             for p in site_prefixes
-            if render_tfvars.extract_vlan_association(p) is not None
+            if (vlan_vid := render_tfvars.extract_vlan_association(p)) is not None
         }
         site_vlans_with_prefixes = [
             v for v in site_vlans if render_tfvars.extract_vlan_id(v) in prefix_vlan_ids
@@ -803,8 +918,7 @@ def test_end_to_end_no_cross_site_prefixes():
 
     with tempfile.TemporaryDirectory() as tmpdir:
         input_file = Path(tmpdir) / "input.json"
-        with open(input_file, "w") as f:
-            json.dump(test_data, f)
+        input_file.write_text(json.dumps(test_data))
 
         loaded_data = render_tfvars.load_netbox_export(input_file=input_file)
 
@@ -871,8 +985,7 @@ def test_end_to_end_sparse_vlan_references():
 
     with tempfile.TemporaryDirectory() as tmpdir:
         input_file = Path(tmpdir) / "input.json"
-        with open(input_file, "w") as f:
-            json.dump(test_data, f)
+        input_file.write_text(json.dumps(test_data))
 
         loaded_data = render_tfvars.load_netbox_export(input_file=input_file)
 
@@ -899,6 +1012,59 @@ def test_end_to_end_sparse_vlan_references():
     print("✅ test_end_to_end_sparse_vlan_references passed")
 
 
+def test_index_resources_by_site():
+    """Test single-pass site indexing of VLANs and prefixes."""
+    vlans = [
+        {"id": 180, "vid": 10, "site": {"slug": "site-a", "name": "Site A"}},
+        {"id": 181, "vid": 20, "site": "site-b"},
+        {"id": 182, "vid": 30, "site": None},
+    ]
+    prefixes = [
+        {"prefix": "10.1.0.0/24", "vlan": {"id": 180, "vid": 10}},
+        {"prefix": "10.2.0.0/24", "site": "site-b", "vlan": 20},
+        {"prefix": "10.0.0.0/8", "vlan": None},
+    ]
+    vlan_mapping = render_tfvars.build_vlan_site_mapping(vlans)
+    vlan_id_to_site = render_tfvars.build_vlan_id_to_site_mapping(vlans)
+
+    vlan_index = render_tfvars.index_resources_by_site(vlans, "vlan")
+    assert [v["vid"] for _, v in vlan_index["site-a"]] == [10]
+    assert [v["vid"] for _, v in vlan_index["site-b"]] == [20]
+    assert [v["vid"] for _, v in vlan_index[None]] == [30]
+
+    prefix_index = render_tfvars.index_resources_by_site(
+        prefixes, "prefix", vlan_mapping, vlan_id_to_site
+    )
+    assert [p["prefix"] for _, p in prefix_index["site-a"]] == ["10.1.0.0/24"]
+    assert [p["prefix"] for _, p in prefix_index["site-b"]] == ["10.2.0.0/24"]
+    assert [p["prefix"] for _, p in prefix_index[None]] == ["10.0.0.0/8"]
+
+    print("✅ test_index_resources_by_site passed")
+
+
+def test_select_site_resources_matches_slug_and_name():
+    """Test site selection matches slug or name and keeps input order."""
+    vlans = [
+        {"vid": 10, "site": "site-a"},
+        {"vid": 20, "site": "Site A"},
+        {"vid": 30, "site": "site-b"},
+        {"vid": 40, "site": "site-a"},
+    ]
+
+    index = render_tfvars.index_resources_by_site(vlans, "vlan")
+    selected = render_tfvars.select_site_resources(index, "site-a", "Site A")
+
+    # Same result as the per-site linear filter
+    expected = render_tfvars.filter_resources_by_site(vlans, "site-a", "Site A", "vlan")
+    assert selected == expected
+    assert [v["vid"] for v in selected] == [10, 20, 40]
+
+    # Unknown site yields nothing
+    assert render_tfvars.select_site_resources(index, "site-z", "Site Z") == []
+
+    print("✅ test_select_site_resources_matches_slug_and_name passed")
+
+
 def run_all_tests():
     """Run all test functions."""
     print("=" * 70)
@@ -911,14 +1077,19 @@ def run_all_tests():
         test_extract_vlan_id,
         test_extract_vlan_association,
         test_extract_site_slug,
+        test_extract_site_from_vlan,
         test_render_site_tfvars,
         test_render_site_tfvars_with_netbox_status_objects,
         test_render_site_tfvars_with_null_vlan_id,
+        test_render_site_tfvars_with_rendered_tags,
         test_deterministic_output,
         test_write_and_read_tfvars,
+        test_render_site_tfvars_text,
         test_load_netbox_export_from_file,
         test_load_netbox_export_from_directory,
+        test_load_json_file_accepts_standard_json_extensions,
         test_json_keys_are_sorted,
+        test_render_site_tfvars_keys_in_canonical_order,
         test_build_vlan_site_mapping,
         test_build_vlan_id_to_site_mapping,
         test_extract_prefix_site_via_vlan,
@@ -934,6 +1105,8 @@ def run_all_tests():
         test_composite_key_mapping_same_vid_different_sites,
         test_end_to_end_no_cross_site_prefixes,
         test_end_to_end_sparse_vlan_references,
+        test_index_resources_by_site,
+        test_select_site_resources_matches_slug_and_name,
     ]
 
     passed = 0
@@ -18,6 +18,52 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 import render_unifi  # noqa: E402
 
+# Shared fixture data. The renderers only read their inputs, so the same
+# objects are safely reused by every test that needs them. Records stay plain
+# dicts because render_unifi dispatches on isinstance(..., dict), which a
+# MappingProxyType wrapper would not satisfy.
+SITE_PENNINGTON = {
+    "name": "site-pennington",
+    "slug": "site-pennington",
+    "description": "Primary residence",
+}
+
+HOME_LAN_PREFIXES = (
+    {
+        "prefix": "192.168.10.0/24",
+        "vlan": 10,
+        "description": "Home LAN",
+        "status": "active",
+    },
+)
+
+HOME_LAN_VLANS = (
+    {
+        "vlan_id": 10,
+        "name": "Home LAN",
+        "description": "Default VLAN",
+        "status": "active",
+    },
+)
+
+TEST_SITE = {"name": "test-site", "slug": "test-site", "description": "Test"}
+TEST_PREFIXES = ({"prefix": "10.0.0.0/24", "vlan": 1, "description": "Test"},)
+TEST_VLANS = ({"vlan_id": 1, "name": "Test VLAN", "description": "Test"},)
+
+# Minimal NetBox export used by the loader tests, serialized once both as a
+# consolidated file and as one file per resource type
+NETBOX_EXPORT = {
+    "sites": [{"name": "test-site", "slug": "test-site"}],
+    "prefixes": [{"site": "test-site", "prefix": "10.0.0.0/24"}],
+    "vlans": [{"site": "test-site", "vlan_id": 1, "name": "Test"}],
+    "tags": [{"name": "test", "slug": "test"}],
+}
+NETBOX_EXPORT_JSON = json.dumps(NETBOX_EXPORT)
+NETBOX_EXPORT_FILES_JSON = {
+    resource_name: json.dumps(records)
+    for resource_name, records in NETBOX_EXPORT.items()
+}
+
 
 def test_extract_site_slug():
     """Test site slug extraction logic."""
@@ -38,13 +84,7 @@ def test_extract_site_slug():
 
 def test_render_unifi_site():
     """Test UniFi site rendering."""
-    site = {
-        "name": "site-pennington",
-        "slug": "site-pennington",
-        "description": "Primary residence",
-    }
-
-    result = render_unifi.render_unifi_site(site)
+    result = render_unifi.render_unifi_site(SITE_PENNINGTON)
 
     assert "name" in result
     assert "desc" in result
@@ -57,12 +97,7 @@ def test_render_unifi_site():
 def test_render_unifi_networks():
     """Test UniFi network rendering from prefixes."""
     prefixes = [
-        {
-            "prefix": "192.168.10.0/24",
-            "vlan": 10,
-            "description": "Home LAN",
-            "status": "active",
-        },
+        *HOME_LAN_PREFIXES,
         {
             "prefix": "192.168.20.0/24",
             "vlan": None,
@@ -98,12 +133,7 @@ def test_render_unifi_networks():
 def test_render_unifi_vlans():
     """Test UniFi VLAN rendering."""
     vlans = [
-        {
-            "vlan_id": 10,
-            "name": "Home LAN",
-            "description": "Default VLAN",
-            "status": "active",
-        },
+        *HOME_LAN_VLANS,
         {
             "vlan_id": 20,
             "name": "Guest VLAN",
@@ -144,31 +174,9 @@ def test_render_unifi_wlans():
 
 def test_render_site_unifi_config():
     """Test complete UniFi config rendering for a site."""
-    site = {
-        "name": "site-pennington",
-        "slug": "site-pennington",
-        "description": "Primary residence",
-    }
-
-    prefixes = [
-        {
-            "prefix": "192.168.10.0/24",
-            "vlan": 10,
-            "description": "Home LAN",
-            "status": "active",
-        }
-    ]
-
-    vlans = [
-        {
-            "vlan_id": 10,
-            "name": "Home LAN",
-            "description": "Default VLAN",
-            "status": "active",
-        }
-    ]
-
-    result = render_unifi.render_site_unifi_config(site, prefixes, vlans)
+    result = render_unifi.render_site_unifi_config(
+        SITE_PENNINGTON, HOME_LAN_PREFIXES, HOME_LAN_VLANS
+    )
 
     # Validate structure
     assert "_warning" in result
@@ -198,21 +206,17 @@ def test_render_site_unifi_config():
 
 def test_deterministic_output():
     """Test that the same input produces the same output (determinism)."""
-    # Create test data
-    site = {"name": "test-site", "slug": "test-site", "description": "Test"}
-    prefixes = [{"prefix": "10.0.0.0/24", "vlan": 1, "description": "Test"}]
-    vlans = [{"vlan_id": 1, "name": "Test VLAN", "description": "Test"}]
-
-    # Generate config multiple times
-    results = []
-    for _ in range(3):
-        result = render_unifi.render_site_unifi_config(site, prefixes, vlans)
-        # Convert to JSON string with sorted keys
-        json_str = json.dumps(result, indent=2, sort_keys=True)
-        results.append(json_str)
-
-    # All results should be identical
-    assert all(r == results[0] for r in results), "Output is not deterministic!"
+    # Render once from the shared fixtures and once from fresh copies of them;
+    # sorted-key JSON of equal dicts is identical, so comparing the dicts
+    # directly is sufficient
+    first = render_unifi.render_site_unifi_config(TEST_SITE, TEST_PREFIXES, TEST_VLANS)
+    second = render_unifi.render_site_unifi_config(
+        dict(TEST_SITE),
+        [dict(p) for p in TEST_PREFIXES],
+        [dict(v) for v in TEST_VLANS],
+    )
+
+    assert first == second, "Output is not deterministic!"
 
     print("✅ test_deterministic_output passed")
 
@@ -237,36 +241,41 @@ def test_write_and_read_config():
         # Verify file exists
         assert output_path.exists(), "Output file was not created"
 
-        # Read and parse the file
-        with open(output_path, "r") as f:
-            loaded_data = json.load(f)
+        # Read the file once and parse it
+        content = output_path.read_text()
+        loaded_data = json.loads(content)
 
         # Verify data matches
         assert loaded_data == test_config, "Written data does not match input"
 
         # Verify file has trailing newline
-        with open(output_path, "r") as f:
-            content = f.read()
         assert content.endswith("\n"), "File should end with newline"
 
     print("✅ test_write_and_read_config passed")
 
 
+def test_render_site_unifi_config_text():
+    """Test that the worker render function matches format_unifi_config."""
+    site = {"name": "Test Site", "slug": "test-site"}
+    prefixes = [{"prefix": "10.0.0.0/24", "vlan": 10, "description": "LAN"}]
+    vlans = [{"vlan_id": 10, "name": "LAN"}]
+
+    text = render_unifi.render_site_unifi_config_text((site, prefixes, vlans))
+    config = render_unifi.render_site_unifi_config(site, prefixes, vlans)
+
+    assert text == json.dumps(config, indent=2, sort_keys=True) + "\n"
+    assert text == render_unifi.format_unifi_config(config)
+
+    print("✅ test_render_site_unifi_config_text passed")
+
+
 def test_load_netbox_export_from_file():
     """Test loading NetBox export from a single consolidated file."""
-    test_data = {
-        "sites": [{"name": "test-site", "slug": "test-site"}],
-        "prefixes": [{"site": "test-site", "prefix": "10.0.0.0/24"}],
-        "vlans": [{"site": "test-site", "vlan_id": 1, "name": "Test"}],
-        "tags": [{"name": "test", "slug": "test"}],
-    }
-
     with tempfile.TemporaryDirectory() as tmpdir:
         input_file = Path(tmpdir) / "test-input.json"
 
         # Write test input file
-        with open(input_file, "w") as f:
-            json.dump(test_data, f)
+        input_file.write_text(NETBOX_EXPORT_JSON)
 
         # Load using the function
         result = render_unifi.load_netbox_export(input_file=input_file)
@@ -287,17 +296,8 @@ def test_load_netbox_export_from_directory():
         input_dir = Path(tmpdir)
 
         # Create separate files
-        with open(input_dir / "sites.json", "w") as f:
-            json.dump([{"name": "test-site", "slug": "test-site"}], f)
-
-        with open(input_dir / "prefixes.json", "w") as f:
-            json.dump([{"site": "test-site", "prefix": "10.0.0.0/24"}], f)
-
-        with open(input_dir / "vlans.json", "w") as f:
-            json.dump([{"site": "test-site", "vlan_id": 1, "name": "Test"}], f)
-
-        with open(input_dir / "tags.json", "w") as f:
-            json.dump([{"name": "test", "slug": "test"}], f)
+        for resource_name, payload in NETBOX_EXPORT_FILES_JSON.items():
+            (input_dir / f"{resource_name}.json").write_text(payload)
 
         # Load using the function
         result = render_unifi.load_netbox_export(input_dir=input_dir)
@@ -311,29 +311,97 @@ def test_load_netbox_export_from_directory():
     print("✅ test_load_netbox_export_from_directory passed")
 
 
+def test_load_json_file_accepts_standard_json_extensions():
+    """Test that inputs parse exactly as the standard library json module does."""
+    # NaN and integers wider than 64 bits are accepted by json.loads
+    text = '{"sites": [{"name": "s", "latitude": NaN, "id": 18446744073709551616}]}'
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_file = Path(tmpdir) / "input.json"
+        input_file.write_text(text)
+        result = render_unifi.load_json_file(input_file)
+
+    site = result["sites"][0]
+    assert site["latitude"] != site["latitude"]
+    assert site["id"] == 2**64
+
+    print("✅ test_load_json_file_accepts_standard_json_extensions passed")
+
+
 def test_json_keys_are_sorted():
     """Test that JSON output has sorted keys for determinism."""
     site = {"name": "zzz-site", "slug": "aaa-slug", "description": "mmm-desc"}
-    prefixes = []
-    vlans = []
 
-    result = render_unifi.render_site_unifi_config(site, prefixes, vlans)
+    result = render_unifi.render_site_unifi_config(site, TEST_PREFIXES, TEST_VLANS)
+    json_str = render_unifi.format_unifi_config(result)
 
-    # When we dump with sort_keys=True, the JSON output should have sorted keys
-    json_str = json.dumps(result, indent=2, sort_keys=True)
+    # Parse back, checking the key order of every object as it is decoded
+    def check_pairs(pairs):
+        keys = [key for key, _ in pairs]
+        assert keys == sorted(keys), f"Keys are not sorted: {keys}"
+        return dict(pairs)
 
-    # Parse back and verify top-level keys are sorted in the JSON string
-    parsed = json.loads(json_str)
-    json_str_keys = json.dumps(parsed, indent=2, sort_keys=True)
-
-    # With sort_keys=True, we should get deterministic output
-    assert (
-        json_str == json_str_keys
-    ), "JSON output with sort_keys=True should be deterministic"
+    assert json.loads(json_str, object_pairs_hook=check_pairs) == result
 
     print("✅ test_json_keys_are_sorted passed")
 
 
+def test_select_site_vlans():
+    """Test VLAN lookup by site slug or name from the site index."""
+    vlans = [
+        {"vlan_id": 10, "name": "A", "site": "site-a"},
+        {"vlan_id": 20, "name": "B", "site": {"slug": "site-b", "name": "Site B"}},
+        {"vlan_id": 30, "name": "C", "site": {"name": "Site A"}},
+        {"vlan_id": 40, "name": "D", "site": "site-a"},
+    ]
+
+    index = render_unifi.index_vlans_by_site(vlans)
+
+    site_a = render_unifi.select_site_vlans(index, "site-a", "Site A")
+    assert [v["vlan_id"] for v in site_a] == [10, 30, 40], "Should keep input order"
+
+    site_b = render_unifi.select_site_vlans(index, "site-b", "Site B")
+    assert [v["vlan_id"] for v in site_b] == [20]
+
+    assert render_unifi.select_site_vlans(index, "site-c", "Site C") == []
+
+    # Site fields that are neither objects nor strings never match a site
+    index = render_unifi.index_vlans_by_site(
+        [{"vlan_id": 50, "site": 7}, {"vlan_id": 60, "site": ["site-a"]}]
+    )
+    assert [v["vlan_id"] for _, v in index[None]] == [50, 60]
+
+    print("✅ test_select_site_vlans passed")
+
+
+def test_select_site_prefixes():
+    """Test prefix selection by direct site field and VLAN association."""
+    prefixes = [
+        {"prefix": "10.0.10.0/24", "vlan": {"vid": 10}},
+        {"prefix": "10.0.20.0/24", "vlan": 20, "site": "site-a"},
+        {"prefix": "10.0.99.0/24", "site": "site-a"},
+        {"prefix": "10.0.30.0/24", "vlan": 30, "site": "site-b"},
+        {"prefix": "10.1.10.0/24", "vlan": 10},
+    ]
+
+    index = render_unifi.index_prefixes(prefixes)
+    result = render_unifi.select_site_prefixes(
+        prefixes, index, "site-a", "Site A", {10}
+    )
+
+    # VLAN 10 matched by association (last one wins), VLAN 20 by site field,
+    # the prefix without a VLAN and the other site's prefix are skipped
+    assert [p["prefix"] for p in result] == ["10.1.10.0/24", "10.0.20.0/24"]
+
+    # An unrecognised site field is indexed under None instead of raising
+    by_site, _ = render_unifi.index_prefixes(
+        [{"prefix": "10.0.40.0/24", "vlan": 40, "site": ["site-a"]}]
+    )
+    assert dict(by_site) == {None: [(0, 40)]}
+
+    print("✅ test_select_site_prefixes passed")
+
+
 def run_all_tests():
     """Run all test functions."""
     print("=" * 70)
@@ -350,9 +418,13 @@ def run_all_tests():
         test_render_site_unifi_config,
         test_deterministic_output,
         test_write_and_read_config,
+        test_render_site_unifi_config_text,
         test_load_netbox_export_from_file,
         test_load_netbox_export_from_directory,
+        test_load_json_file_accepts_standard_json_extensions,
         test_json_keys_are_sorted,
+        test_select_site_vlans,
+        test_select_site_prefixes,
     ]
 
     passed = 0
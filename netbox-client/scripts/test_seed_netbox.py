@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""Tests for seed_netbox.py script.
+
+This test suite validates the NetBox API helpers against a fake API
+session, so no NetBox instance is needed.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import requests
+
+# Add parent directory to path for imports
+# This allows importing seed_netbox module for testing without
+# requiring a package structure. This is acceptable for simple test scripts
+# in the same directory as the module being tested.
+sys.path.insert(0, str(Path(__file__).parent))
+
+# nb_config requires a token at import time; the fake session never sends it
+os.environ.setdefault("NETBOX_API_TOKEN", "test-token")
+
+import seed_netbox  # noqa: E402
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.text = str(body)
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error", response=self
+            )
+
+
+class FakeSession:
+    """Records requests and answers them with the given handler functions.
+
+    Handlers receive the request arguments and return a FakeResponse or
+    raise a RequestException.
+    """
+
+    def __init__(self, get=None, post=None):
+        self.get_handler = get
+        self.post_handler = post
+        self.calls = []
+
+    def get(self, url, params=None):
+        self.calls.append(("GET", url, params))
+        return self.get_handler(url, params)
+
+    def post(self, url, json=None):
+        self.calls.append(("POST", url, json))
+        return self.post_handler(url, json)
+
+
+def with_session(session, func, *args, **kwargs):
+    """Call func with seed_netbox.SESSION replaced by session."""
+    original_session = seed_netbox.SESSION
+    seed_netbox.SESSION = session
+    try:
+        return func(*args, **kwargs)
+    finally:
+        seed_netbox.SESSION = original_session
+
+
+def run_quietly(session, func, *args):
+    """Call func with a fake session and return (result, printed output)."""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        result = with_session(session, func, *args)
+    return result, output.getvalue()
+
+
+def page(results, next_url=None):
+    """Build a NetBox list response body."""
+    return FakeResponse({"count": len(results), "next": next_url, "results": results})
+
+
+def test_normalize_prefix():
+    """Test prefixes are keyed the way NetBox compares them."""
+    assert seed_netbox.normalize_prefix("10.0.0.0/24") == "10.0.0.0/24"
+    assert seed_netbox.normalize_prefix("10.0.0.1/24") == "10.0.0.0/24"
+    assert seed_netbox.normalize_prefix("2001:db8::1/64") == "2001:db8::/64"
+
+    # Invalid prefixes are left unchanged
+    assert seed_netbox.normalize_prefix("not-a-prefix") == "not-a-prefix"
+
+    print("✅ test_normalize_prefix passed")
+
+
+def test_fetch_existing_splits_values_into_batches():
+    """Test lookups are split into batches and deduplicated."""
+    batch_size = seed_netbox.EXISTENCE_CHECK_BATCH_SIZE
+    values = list(range(1, 2 * batch_size + 51)) + [1]
+
+    def get(url, params):
+        return page([{"id": vid * 10, "vid": vid} for vid in params["vid"]])
+
+    session = FakeSession(get=get)
+    existing = with_session(
+        session,
+        seed_netbox.fetch_existing,
+        "ipam/vlans/",
+        {"site_id": 7},
+        "vid",
+        values,
+    )
+
+    assert [len(params["vid"]) for _, _, params in session.calls] == [
+        batch_size,
+        batch_size,
+        50,
+    ]
+    for _, url, params in session.calls:
+        assert url == f"{seed_netbox.NETBOX_URL}ipam/vlans/"
+        assert params["site_id"] == 7
+        assert params["limit"] == len(params["vid"])
+
+    # Every value is looked up exactly once, in input order
+    looked_up = [vid for _, _, params in session.calls for vid in params["vid"]]
+    assert looked_up == list(range(1, 2 * batch_size + 51))
+
+    assert len(existing) == 2 * batch_size + 50
+    assert existing["1"] == {"id": 10, "vid": 1}
+
+    print("✅ test_fetch_existing_splits_values_into_batches passed")
+
+
+def test_fetch_existing_follows_pagination():
+    """Test every page of a batch is read via the next link."""
+    next_url = f"{seed_netbox.NETBOX_URL}ipam/vlans/?vid=10&vid=20&offset=1"
+
+    def get(url, params):
+        if url == next_url:
+            return page([{"id": 2, "vid": 20}, {"id": 3, "vid": 10}])
+        return page([{"id": 1, "vid": 10}], next_url=next_url)
+
+    session = FakeSession(get=get)
+    existing = with_session(
+        session, seed_netbox.fetch_existing, "ipam/vlans/", {}, "vid", [10, 20]
+    )
+
+    assert len(session.calls) == 2
+    # The next link carries the query itself
+    assert session.calls[1] == ("GET", next_url, None)
+
+    # The first match for a value wins
+    assert existing == {"10": {"id": 1, "vid": 10}, "20": {"id": 2, "vid": 20}}
+
+    print("✅ test_fetch_existing_follows_pagination passed")
+
+
+def test_fetch_existing_normalizes_prefix_keys():
+    """Test prefixes written with host bits match NetBox's canonical prefix."""
+
+    def get(url, params):
+        return page([{"id": 5, "prefix": "10.0.0.0/24"}])
+
+    session = FakeSession(get=get)
+    existing = with_session(
+        session,
+        seed_netbox.fetch_existing,
+        "ipam/prefixes/",
+        {},
+        "prefix",
+        ["10.0.0.1/24"],
+        key=seed_netbox.normalize_prefix,
+    )
+
+    assert existing == {"10.0.0.0/24": {"id": 5, "prefix": "10.0.0.0/24"}}
+    assert seed_netbox.normalize_prefix("10.0.0.1/24") in existing
+
+    print("✅ test_fetch_existing_normalizes_prefix_keys passed")
+
+
+def test_fetch_existing_raises_on_error():
+    """Test a failed lookup is raised to the caller."""
+
+    def get(url, params):
+        return FakeResponse({"detail": "boom"}, status_code=500)
+
+    session = FakeSession(get=get)
+    try:
+        with_session(session, seed_netbox.fetch_existing, "ipam/vlans/", {}, "vid", [1])
+        assert False, "Expected HTTPError"
+    except requests.exceptions.HTTPError:
+        pass
+
+    print("✅ test_fetch_existing_raises_on_error passed")
+
+
+def test_create_objects_bulk_success():
+    """Test new objects are created with one bulk POST."""
+    payloads = [{"vid": 10}, {"vid": 20}]
+
+    def post(url, body):
+        return FakeResponse([{"id": i + 1, **p} for i, p in enumerate(body)], 201)
+
+    session = FakeSession(post=post)
+    results = with_session(session, seed_netbox.create_objects, "ipam/vlans/", payloads)
+
+    assert session.calls == [("POST", f"{seed_netbox.NETBOX_URL}ipam/vlans/", payloads)]
+    assert results == [{"id": 1, "vid": 10}, {"id": 2, "vid": 20}]
+
+    # Nothing to create means no request at all
+    session = FakeSession()
+    assert with_session(session, seed_netbox.create_objects, "ipam/vlans/", []) == []
+    assert session.calls == []
+
+    print("✅ test_create_objects_bulk_success passed")
+
+
+def test_create_objects_retries_items_after_bad_request():
+    """Test a rejected bulk POST is retried per object, keeping input order."""
+    payloads = [{"vid": 10}, {"vid": 20}, {"vid": 30}]
+
+    def post(url, body):
+        if isinstance(body, list):
+            return FakeResponse({"detail": "invalid"}, status_code=400)
+        if body["vid"] == 20:
+            return FakeResponse({"vid": ["invalid"]}, status_code=400)
+        return FakeResponse({"id": body["vid"] * 10, **body}, 201)
+
+    session = FakeSession(post=post)
+    results = with_session(session, seed_netbox.create_objects, "ipam/vlans/", payloads)
+
+    assert [body for _, _, body in session.calls] == [payloads, *payloads]
+    assert results[0] == {"id": 100, "vid": 10}
+    assert isinstance(results[1], requests.exceptions.HTTPError)
+    assert results[1].response.status_code == 400
+    assert results[2] == {"id": 300, "vid": 30}
+
+    print("✅ test_create_objects_retries_items_after_bad_request passed")
+
+
+def test_create_objects_other_errors_fail_every_object():
+    """Test a non-400 bulk failure is reported for every object, not retried."""
+    payloads = [{"vid": 10}, {"vid": 20}]
+
+    def post_server_error(url, body):
+        return FakeResponse({"detail": "boom"}, status_code=500)
+
+    def post_connection_error(url, body):
+        raise requests.exceptions.ConnectionError("refused")
+
+    for post in (post_server_error, post_connection_error):
+        session = FakeSession(post=post)
+        results = with_session(
+            session, seed_netbox.create_objects, "ipam/vlans/", payloads
+        )
+
+        assert len(session.calls) == 1
+        assert len(results) == len(payloads)
+        assert all(isinstance(r, requests.exceptions.RequestException) for r in results)
+
+    print("✅ test_create_objects_other_errors_fail_every_object passed")
+
+
+def test_seed_vlans_matches_results_to_input_order():
+    """Test created and existing VLANs are returned against the right config."""
+    data = {
+        "vlans": [
+            {"vlan_id": 10, "name": "Home"},
+            {"vlan_id": 20, "name": "IoT"},
+            {"vlan_id": 30, "name": "Guest"},
+            {"vlan_id": 10, "name": "Home again"},
+        ]
+    }
+
+    def get(url, params):
+        return page([{"id": 2, "vid": 20}])
+
+    def post(url, body):
+        return FakeResponse([{"id": p["vid"] * 10, **p} for p in body], 201)
+
+    session = FakeSession(get=get, post=post)
+    vlans, output = run_quietly(
+        session, seed_netbox.seed_vlans, data, "site.yaml", {"id": 7}
+    )
+
+    # Only missing VLANs are posted, once each, in input order
+    posted = session.calls[-1][2]
+    assert [p["vid"] for p in posted] == [10, 30]
+    assert all(p["site"] == 7 for p in posted)
+
+    # Results line up with the config entries they were created for
+    assert [(v["id"], v["vid"]) for v in vlans] == [
+        (100, 10),
+        (2, 20),
+        (300, 30),
+        (100, 10),
+    ]
+    assert "Created VLAN 30 ('Guest') (ID: 300)" in output
+    assert "VLAN 20 ('IoT') already exists (ID: 2)" in output
+
+    print("✅ test_seed_vlans_matches_results_to_input_order passed")
+
+
+def test_seed_vlans_reports_partial_failure():
+    """Test a VLAN that fails to create is reported and never gets an ID."""
+    data = {
+        "vlans": [
+            {"vlan_id": 10, "name": "Home"},
+            {"vlan_id": 20, "name": "Broken"},
+            {"vlan_id": 30, "name": "Guest"},
+            {"vlan_id": 20, "name": "Broken again"},
+        ]
+    }
+
+    def get(url, params):
+        return page([])
+
+    def post(url, body):
+        if isinstance(body, list):
+            return FakeResponse({"detail": "invalid"}, status_code=400)
+        if body["vid"] == 20:
+            return FakeResponse({"name": ["invalid"]}, status_code=400)
+        return FakeResponse({"id": body["vid"] * 10, **body}, 201)
+
+    session = FakeSession(get=get, post=post)
+    vlans, output = run_quietly(
+        session, seed_netbox.seed_vlans, data, "site.yaml", {"id": 7}
+    )
+
+    assert [(v["id"], v["vid"]) for v in vlans] == [(100, 10), (300, 30)]
+    assert output.count("❌ Error creating VLAN 20") == 1
+
+    print("✅ test_seed_vlans_reports_partial_failure passed")
+
+
+def test_seed_prefixes_matches_results_to_input_order():
+    """Test prefixes are matched by canonical form and linked to their VLAN."""
+    data = {
+        "prefixes": [
+            {"prefix": "10.0.10.0/24", "vlan": 10},
+            {"prefix": "10.0.20.1/24", "vlan": 20},
+            {"prefix": "10.0.30.0/24"},
+        ]
+    }
+    vlans = [{"id": 100, "vid": 10}, {"id": 200, "vid": 20}]
+
+    def get(url, params):
+        return page([{"id": 2, "prefix": "10.0.20.0/24"}])
+
+    def post(url, body):
+        return FakeResponse([{"id": i + 50, **p} for i, p in enumerate(body)], 201)
+
+    session = FakeSession(get=get, post=post)
+    prefixes, output = run_quietly(
+        session, seed_netbox.seed_prefixes, data, "site.yaml", {"id": 7}, vlans
+    )
+
+    posted = session.calls[-1][2]
+    assert [p["prefix"] for p in posted] == ["10.0.10.0/24", "10.0.30.0/24"]
+    assert posted[0]["vlan"] == 100
+    assert "vlan" not in posted[1]
+
+    assert [(p["id"], p["prefix"]) for p in prefixes] == [
+        (50, "10.0.10.0/24"),
+        (2, "10.0.20.0/24"),
+        (51, "10.0.30.0/24"),
+    ]
+    assert "Prefix 10.0.20.1/24 already exists (ID: 2)" in output
+
+    print("✅ test_seed_prefixes_matches_results_to_input_order passed")
+
+
+def test_seed_files_concurrently_groups_output_by_file():
+    """Test --jobs output is printed per file, in the order files were given."""
+    site_count = 4
+    stdout_seen = set()
+
+    def delay(slug):
+        # Earlier files finish last, so completion order is reversed
+        time.sleep(0.02 * (site_count - int(slug.rsplit("-", 1)[1])))
+
+    def get(url, params):
+        stdout_seen.add(id(sys.stdout))
+        if url.endswith("dcim/sites/"):
+            delay(params["slug"])
+            return page([])
+        return page([])
+
+    def post(url, body):
+        if url.endswith("dcim/sites/"):
+            return FakeResponse({"id": int(body["slug"].rsplit("-", 1)[1]), **body})
+        delay(f"site-{body[0]['site']}")
+        return FakeResponse([{"id": 1, **p} for p in body], 201)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = []
+        for n in range(site_count):
+            path = Path(tmpdir) / f"site-{n}.yaml"
+            path.write_text(
+                f"site:\n  name: site-{n}\n"
+                "vlans:\n  - vlan_id: 10\n    name: LAN\n"
+                f"prefixes:\n  - prefix: 10.{n}.0.0/24\n    vlan: 10\n"
+            )
+            files.append(str(path))
+
+        output = io.StringIO()
+        session = FakeSession(get=get, post=post)
+        with redirect_stdout(output):
+            results = with_session(
+                session, lambda: list(seed_netbox.seed_files_concurrently(files, 4))
+            )
+
+    assert results == [True] * site_count
+
+    # Workers never write to, or swap, the process-wide stdout
+    assert stdout_seen == {id(output)}
+
+    # Each file's lines form one contiguous block, in input order
+    blocks = output.getvalue().split(f"\n{'=' * 60}\nProcessing: ")[1:]
+    assert len(blocks) == site_count
+    for n, block in enumerate(blocks):
+        assert block.startswith(files[n])
+        assert f"Created site 'site-{n}'" in block
+        assert f"Created prefix 10.{n}.0.0/24" in block
+        assert f"Site=site-{n}, VLANs=1, Prefixes=1" in block
+        for other in range(site_count):
+            if other != n:
+                assert f"site-{other}'" not in block
+
+    print("✅ test_seed_files_concurrently_groups_output_by_file passed")
+
+
+def run_all_tests():
+    """Run all test functions."""
+    print("=" * 70)
+    print("Running seed_netbox.py tests")
+    print("=" * 70)
+    print()
+
+    test_functions = [
+        test_normalize_prefix,
+        test_fetch_existing_splits_values_into_batches,
+        test_fetch_existing_follows_pagination,
+        test_fetch_existing_normalizes_prefix_keys,
+        test_fetch_existing_raises_on_error,
+        test_create_objects_bulk_success,
+        test_create_objects_retries_items_after_bad_request,
+        test_create_objects_other_errors_fail_every_object,
+        test_seed_vlans_matches_results_to_input_order,
+        test_seed_vlans_reports_partial_failure,
+        test_seed_prefixes_matches_results_to_input_order,
+        test_seed_files_concurrently_groups_output_by_file,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in test_functions:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test_func.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"❌ {test_func.__name__} error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 70)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("=" * 70)
+
+    if failed > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
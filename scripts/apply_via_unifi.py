@@ -6,19 +6,32 @@ This script provides an alternative to Terraform when the provider has issues.
 """
 
 import argparse
+import functools
 import hashlib
 import ipaddress
 import json
 import os
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-# Add tests/integration to path for imports  # noqa: E402
-sys.path.insert(0, str(Path(__file__).parent.parent / "tests" / "integration"))
+# The UniFi API client lives under tests/integration and is imported in main()
+# only when a controller is contacted, so --help, --dry-run and scripts that
+# import the helpers below do not load requests/urllib3
+INTEGRATION_TESTS_DIR = Path(__file__).parent.parent / "tests" / "integration"
 
-from helpers.unifi_client import UniFiClient  # noqa: E402
+if TYPE_CHECKING:
+    from helpers.unifi_client import UniFiClient
+
+# Upper bound on concurrent controller requests (--jobs). Kept below the
+# default requests connection pool size (10) so workers never wait on a
+# free connection.
+APPLY_MAX_WORKERS = 8
+
+# Read size for checksumming on Pythons without hashlib.file_digest (< 3.11)
+CHECKSUM_CHUNK_SIZE = 128 * 1024
 
 
 def load_tfvars(tfvars_path: Path) -> Dict[str, Any]:
@@ -46,13 +59,40 @@ def calculate_file_checksum(file_path: Path) -> str:
     Returns:
         Hex digest of SHA256 hash
     """
-    sha256 = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            sha256.update(chunk)
+        if hasattr(hashlib, "file_digest"):
+            # Reads and hashes in C without a Python-level loop
+            sha256 = hashlib.file_digest(f, "sha256")
+        else:
+            sha256 = hashlib.sha256()
+            for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
+                sha256.update(chunk)
     return f"sha256:{sha256.hexdigest()}"
 
 
+@functools.lru_cache(maxsize=256)
+def parse_ipv4_network(cidr: str) -> ipaddress.IPv4Network:
+    """Parse a CIDR string into an IPv4 network.
+
+    Results are cached: build_network_config derives both the gateway and
+    the DHCP range from the same CIDR, and IPv4Network objects are
+    immutable, so they can be shared safely.
+
+    Args:
+        cidr: Network CIDR (e.g., "10.100.0.0/24"); host bits are allowed
+
+    Returns:
+        Parsed IPv4 network
+
+    Raises:
+        ValueError: If CIDR is invalid
+    """
+    try:
+        return ipaddress.IPv4Network(cidr, strict=False)
+    except (ValueError, ipaddress.AddressValueError) as e:
+        raise ValueError(f"Invalid CIDR format '{cidr}': {e}") from e
+
+
 def calculate_dhcp_range(
     cidr: str, start_offset: int = 6, end_offset: int = 254
 ) -> tuple[str, str]:
@@ -75,10 +115,7 @@ def calculate_dhcp_range(
     Raises:
         ValueError: If CIDR is invalid or subnet too small
     """
-    try:
-        network = ipaddress.IPv4Network(cidr, strict=False)
-    except (ValueError, ipaddress.AddressValueError) as e:
-        raise ValueError(f"Invalid CIDR format '{cidr}': {e}") from e
+    network = parse_ipv4_network(cidr)
 
     # Validate subnet is large enough for DHCP
     # Need at least network + gateway + 1 reserved + 2 DHCP IPs + broadcast = 5 minimum
@@ -114,10 +151,7 @@ def cidr_to_gateway(cidr: str) -> str:
     Raises:
         ValueError: If CIDR is invalid
     """
-    try:
-        network = ipaddress.IPv4Network(cidr, strict=False)
-    except (ValueError, ipaddress.AddressValueError) as e:
-        raise ValueError(f"Invalid CIDR format '{cidr}': {e}") from e
+    network = parse_ipv4_network(cidr)
 
     # Gateway is always .1 (first usable IP)
     gateway = network.network_address + 1
@@ -188,11 +222,96 @@ def build_desired_state(tfvars: Dict[str, Any]) -> List[Dict[str, Any]]:
     return networks
 
 
+def network_matches(existing: Dict[str, Any], network_config: Dict[str, Any]) -> bool:
+    """Check whether a controller network already has the desired config.
+
+    Only the fields set by build_network_config are compared; an update
+    merges those into the existing record and leaves every other field
+    untouched, so it would be a no-op when they all match.
+
+    Args:
+        existing: Current controller record for the network
+        network_config: Network configuration to apply
+
+    Returns:
+        True if every desired field is present and already has the desired
+        value
+    """
+    return all(
+        key in existing and existing[key] == value
+        for key, value in network_config.items()
+    )
+
+
+def apply_network(
+    client: "UniFiClient",
+    network_config: Dict[str, Any],
+    existing: Optional[Dict[str, Any]],
+    site: str = "default",
+) -> Tuple[str, Dict[str, Any]]:
+    """Create or update a single network on the UniFi controller.
+
+    Args:
+        client: Authenticated UniFi client
+        network_config: Network configuration to apply
+        existing: Current controller record for this network name, if any
+        site: Site name (default: "default")
+
+    Returns:
+        Tuple of the action taken ("created", "updated" or "unchanged") and
+        the network dictionary returned by (or already on) the controller
+    """
+    if existing:
+        if network_matches(existing, network_config):
+            # Already converged; skip the PUT round trip
+            return "unchanged", existing
+
+        # Update existing network
+        updated_config = {**existing, **network_config}
+        return "updated", client.update_network(existing["_id"], updated_config, site)
+
+    # Create new network; the cache already showed the name is free, so skip
+    # the lookup create_or_update_network would repeat
+    return "created", client.create_network_from_config(network_config, site)
+
+
+def split_unique_name_batches(
+    networks: List[Dict[str, Any]],
+) -> List[List[Dict[str, Any]]]:
+    """Split networks into consecutive batches with unique names.
+
+    A repeated name must see the result of its earlier occurrence (a create
+    followed by an update), so it starts a new batch. Batches are applied one
+    after another; networks within a batch may be applied concurrently.
+
+    Args:
+        networks: List of network configurations, in apply order
+
+    Returns:
+        List of batches that together preserve the input order
+    """
+    batches = []
+    batch = []
+    batch_names = set()
+    for network_config in networks:
+        name = network_config["name"]
+        if name in batch_names:
+            batches.append(batch)
+            batch = []
+            batch_names = set()
+        batch.append(network_config)
+        batch_names.add(name)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 def apply_networks(
-    client: UniFiClient,
+    client: "UniFiClient",
     desired_networks: List[Dict[str, Any]],
     site: str = "default",
     fail_fast: bool = False,
+    jobs: int = 1,
 ) -> Dict[str, Any]:
     """Apply network configurations to UniFi controller.
 
@@ -201,6 +320,10 @@ def apply_networks(
         desired_networks: List of network configurations to apply
         site: Site name (default: "default")
         fail_fast: If True, abort on first failure. If False, collect all failures.
+        jobs: Maximum number of networks to apply concurrently (default: 1,
+            capped at APPLY_MAX_WORKERS). Results and log lines are reported
+            in input order regardless. With fail_fast, networks already in
+            flight still complete before the error is raised.
 
     Returns:
         Dictionary with results: created, updated, unchanged, failures,
@@ -209,6 +332,12 @@ def apply_networks(
     Note:
         When fail_fast=False, partial state is still saved for successful
         operations. This allows recovery from partial failures.
+
+        With jobs > 1 the workers share client and its requests session.
+        The client is logged in before any worker starts (by main(), or by
+        get_networks() below on this thread), so workers never log in again
+        and only read its login state and CSRF token, which nothing changes
+        while the pool runs.
     """
     created = []
     updated = []
@@ -216,52 +345,70 @@ def apply_networks(
     failures = []
 
     # PERFORMANCE: Fetch all networks once and cache for lookups
-    # Avoids repeated API calls in find_network_by_name()
+    # Avoids repeated API calls in find_network_by_name(). This also logs the
+    # client in, if needed, before the worker pool below is started.
     print("Fetching existing networks from controller...")
     all_networks = client.get_networks(site)
     network_cache = {net["name"]: net for net in all_networks}
     print(f"  Found {len(all_networks)} existing network(s)")
 
-    for network_config in desired_networks:
-        name = network_config["name"]
-        print(f"Processing network: {name}")
-
+    def apply_cached(network_config):
+        # Check cache instead of making repeated API calls. Names are unique
+        # within a batch, so concurrent workers never share a cache entry.
+        existing = network_cache.get(network_config["name"])
         try:
-            # Check cache instead of making repeated API calls
-            existing = network_cache.get(name)
-
-            if existing:
-                # Update existing network
-                network_id = existing["_id"]
-                updated_config = {**existing, **network_config}
-                result = client.update_network(network_id, updated_config, site)
-                updated.append(result)
-                vlan_id = network_config.get("vlan")
-                print(f"  ✓ Updated: {name} (VLAN {vlan_id})")
-                # Update cache with new result
-                network_cache[name] = result
-            else:
-                # Create new network
-                result = client.create_or_update_network(network_config, site)
-                created.append(result)
-                print(f"  ✓ Created: {name} (VLAN {network_config.get('vlan')})")
-                # Add to cache
-                network_cache[name] = result
-
+            action, result = apply_network(client, network_config, existing, site)
         except Exception as e:
-            error_msg = str(e)
-            print(f"  ✗ Error processing {name}: {error_msg}")
-            failures.append(
-                {
-                    "network": name,
-                    "vlan_id": network_config.get("vlan"),
-                    "error": error_msg,
-                    "config": network_config,
-                }
-            )
+            return None, None, e
+        return action, result, None
+
+    results_by_action = {
+        "created": created,
+        "updated": updated,
+        "unchanged": unchanged,
+    }
 
-            if fail_fast:
-                raise
+    max_workers = max(1, min(jobs, APPLY_MAX_WORKERS, len(desired_networks)))
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    try:
+        for batch in split_unique_name_batches(desired_networks):
+            # Results arrive in input order; a sequential run applies each
+            # network lazily as its result is requested
+            if executor:
+                outcomes = executor.map(apply_cached, batch)
+            else:
+                outcomes = map(apply_cached, batch)
+
+            for network_config in batch:
+                name = network_config["name"]
+                print(f"Processing network: {name}")
+                action, result, error = next(outcomes)
+
+                if error is None:
+                    results_by_action[action].append(result)
+                    vlan_id = network_config.get("vlan")
+                    print(f"  ✓ {action.capitalize()}: {name} (VLAN {vlan_id})")
+                    # Keep the cache current for later batches
+                    network_cache[name] = result
+                    continue
+
+                error_msg = str(error)
+                print(f"  ✗ Error processing {name}: {error_msg}")
+                failures.append(
+                    {
+                        "network": name,
+                        "vlan_id": network_config.get("vlan"),
+                        "error": error_msg,
+                        "config": network_config,
+                    }
+                )
+
+                if fail_fast:
+                    raise error
+    finally:
+        if executor:
+            # On fail-fast, drop networks that have not been started yet
+            executor.shutdown(cancel_futures=True)
 
     return {
         "created": created,
@@ -283,9 +430,12 @@ def save_state(
         tfvars_checksum: Checksum of tfvars file
         site: Site name
     """
+    # One timestamp for the whole save, in the same ISO 8601 "Z" format
+    applied_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
     state = {
         "format_version": "1.0",
-        "applied_at": datetime.utcnow().isoformat() + "Z",
+        "applied_at": applied_at,
         "applied_by": os.getenv("GITHUB_ACTOR", os.getenv("USER", "unknown")),
         "site": site,
         "tfvars_checksum": tfvars_checksum,
@@ -295,7 +445,7 @@ def save_state(
                 "name": net.get("name"),
                 "vlan_id": net.get("vlan"),
                 "subnet": net.get("ip_subnet"),
-                "created_at": datetime.utcnow().isoformat() + "Z",
+                "created_at": applied_at,
                 "source": "netbox",
             }
             for net in state_data["current_state"]
@@ -305,9 +455,12 @@ def save_state(
     # Ensure parent directory exists
     state_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write state file
-    with open(state_file, "w") as f:
-        json.dump(state, f, indent=2)
+    # Write state file: serialize once, write it next to the target and
+    # rename it into place so an interrupted run never leaves a truncated
+    # state file behind
+    tmp_file = state_file.with_name(f"{state_file.name}.tmp")
+    tmp_file.write_text(json.dumps(state, indent=2))
+    os.replace(tmp_file, state_file)
 
     print(f"\n✓ State saved to: {state_file}")
 
@@ -344,6 +497,15 @@ def main():
         action="store_true",
         help="Abort on first failure (default: continue and collect all failures)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of networks to apply concurrently (default: 1, "
+            f"max: {APPLY_MAX_WORKERS})"
+        ),
+    )
 
     args = parser.parse_args()
 
@@ -387,8 +549,12 @@ def main():
         return 0
 
     # Connect to UniFi
+    sys.path.insert(0, str(INTEGRATION_TESTS_DIR))
+    from helpers.unifi_client import UniFiClient
+
     print("\nConnecting to UniFi controller...")
     client = UniFiClient()
+    # Log in once up front; --jobs workers share this authenticated session
     client.login()
     print("  ✓ Authenticated")
 
@@ -396,7 +562,9 @@ def main():
     net_count = len(desired_networks)
     print(f"\nApplying {net_count} network(s)...")
     try:
-        result = apply_networks(client, desired_networks, args.site, args.fail_fast)
+        result = apply_networks(
+            client, desired_networks, args.site, args.fail_fast, args.jobs
+        )
 
         print("\nSummary:")
         print(f"  Created: {len(result['created'])}")
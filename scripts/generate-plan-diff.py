@@ -7,6 +7,133 @@ This script creates a markdown summary suitable for both humans and automated to
 import json
 import sys
 from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    import ijson
+except ImportError:
+    # ijson is optional; without it large plans are parsed in one go
+    ijson = None
+
+# Plans larger than this are streamed with ijson (when installed), keeping
+# only the fields the summary uses instead of every before/after state blob
+STREAMING_THRESHOLD_BYTES = 50_000_000
+
+SCALAR_EVENTS = frozenset(("string", "number", "boolean", "null"))
+
+# Map Terraform's primary change action to (summary key, display symbol)
+ACTION_MAP = {
+    "create": ("create", "+"),
+    "update": ("update", "~"),
+    "delete": ("delete", "-"),
+    "no-op": ("no-op", ""),
+    "read": ("read", "⊙"),
+}
+
+
+def stream_plan(f) -> Dict[str, Any]:
+    """Incrementally parse the fields of a JSON plan used by the summary.
+
+    Only terraform_version, format_version and each resource change's
+    address and change.actions are kept; everything else is skipped as it
+    is parsed. Numbers are parsed as floats and null values are kept, so the
+    result matches what json.loads returns for the same fields.
+
+    Args:
+        f: Plan file opened in binary mode
+
+    Returns:
+        Plan dictionary reduced to the fields used by the summary
+    """
+    plan = {}
+    resource_changes = None
+    resource = None
+    change = None
+    actions = None
+
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if prefix == "resource_changes":
+            if event == "start_array":
+                resource_changes = plan["resource_changes"] = []
+            elif event in SCALAR_EVENTS:
+                plan["resource_changes"] = value
+        elif prefix == "resource_changes.item":
+            if event == "start_map":
+                resource = {}
+                resource_changes.append(resource)
+            elif event in SCALAR_EVENTS:
+                resource_changes.append(value)
+        elif prefix == "resource_changes.item.address":
+            if event in SCALAR_EVENTS:
+                resource["address"] = value
+        elif prefix == "resource_changes.item.change":
+            if event == "start_map":
+                change = resource["change"] = {}
+            elif event in SCALAR_EVENTS:
+                resource["change"] = value
+        elif prefix == "resource_changes.item.change.actions":
+            if event == "start_array":
+                actions = change["actions"] = []
+            elif event in SCALAR_EVENTS:
+                change["actions"] = value
+        elif prefix == "resource_changes.item.change.actions.item":
+            if event in SCALAR_EVENTS:
+                actions.append(value)
+        elif prefix in ("terraform_version", "format_version"):
+            if event in SCALAR_EVENTS:
+                plan[prefix] = value
+
+    return plan
+
+
+def load_plan(json_file: str) -> Dict[str, Any]:
+    """Load a Terraform JSON plan.
+
+    The file is read as bytes in one call and parsed with json.loads. Plans
+    larger than STREAMING_THRESHOLD_BYTES are streamed with ijson instead
+    when it is installed, see stream_plan.
+
+    Args:
+        json_file: Path to the JSON plan file
+
+    Returns:
+        Parsed plan dictionary
+    """
+    plan_path = Path(json_file)
+    if ijson is not None and plan_path.stat().st_size > STREAMING_THRESHOLD_BYTES:
+        with open(plan_path, "rb") as f:
+            return stream_plan(f)
+    return json.loads(plan_path.read_bytes())
+
+
+def iter_changes(resource_changes):
+    """Yield the summary key and address of each resource that changes.
+
+    Resources without actions, or whose primary action is no-op, are
+    skipped. Actions missing from ACTION_MAP are reported under their own
+    name.
+
+    Args:
+        resource_changes: The plan's resource_changes list
+
+    Yields:
+        (action key, address) tuples
+    """
+    get_action = ACTION_MAP.get
+
+    for resource in resource_changes:
+        actions = (resource.get("change") or {}).get("actions")
+
+        # Categorize by primary action
+        if not actions or actions[0] == "no-op":
+            continue
+
+        primary_action = actions[0]
+        yield (
+            get_action(primary_action, (primary_action,))[0],
+            resource.get("address", "unknown"),
+        )
 
 
 def main():
@@ -20,80 +147,65 @@ def main():
     site = sys.argv[2]
 
     # Read JSON plan
-    with open(json_file, "r") as f:
-        plan = json.load(f)
+    plan = load_plan(json_file)
 
     # Extract metadata
     tf_version = plan.get("terraform_version", "unknown")
     format_version = plan.get("format_version", "unknown")
 
-    # Count and categorize changes
+    # Count and categorize changes, keeping only the addresses per action
     changes_by_action = defaultdict(list)
     total_changes = 0
 
-    for resource in plan.get("resource_changes", []):
-        address = resource.get("address", "unknown")
-        actions = resource.get("change", {}).get("actions", [])
+    for action_key, address in iter_changes(plan.get("resource_changes", [])):
+        total_changes += 1
+        changes_by_action[action_key].append(address)
 
-        # Categorize by primary action
-        primary_action = actions[0] if actions else "no-op"
-
-        # Map action to display format
-        action_map = {
-            "create": ("create", "+"),
-            "update": ("update", "~"),
-            "delete": ("delete", "-"),
-            "no-op": ("no-op", ""),
-            "read": ("read", "⊙"),
-        }
-
-        action_key, symbol = action_map.get(primary_action, (primary_action, "?"))
-
-        if primary_action != "no-op":
-            total_changes += 1
-            changes_by_action[action_key].append((address, symbol))
-
-    # Generate markdown summary
-    print("# Terraform Plan Diff Summary")
-    print(f"\n**Site**: `{site}`")
-    print(f"**Terraform Version**: `{tf_version}`")
-    print(f"**Format Version**: `{format_version}`")
-    print("")
+    # Sort resources alphabetically once for deterministic output; the same
+    # lists feed both the detailed section and the machine-readable summary
+    for addresses in changes_by_action.values():
+        addresses.sort()
+
+    # Generate markdown summary, buffered and written in one go at the end
+    out = []
+    out.append("# Terraform Plan Diff Summary")
+    out.append(f"\n**Site**: `{site}`")
+    out.append(f"**Terraform Version**: `{tf_version}`")
+    out.append(f"**Format Version**: `{format_version}`")
+    out.append("")
 
     # Summary counts
-    print("## Change Summary")
-    print("")
+    out.append("## Change Summary")
+    out.append("")
     if total_changes == 0:
-        print("✅ **No changes.** Infrastructure is up-to-date.")
+        out.append("✅ **No changes.** Infrastructure is up-to-date.")
     else:
-        print(f"📝 **{total_changes} resource(s)** will be modified:")
-        print("")
+        out.append(f"📝 **{total_changes} resource(s)** will be modified:")
+        out.append("")
         for action in ["create", "update", "delete"]:
             count = len(changes_by_action[action])
             if count > 0:
                 action_emoji = {"create": "➕", "update": "📝", "delete": "🗑️"}
-                print(
+                out.append(
                     f"- {action_emoji.get(action, '•')} "
                     f"**{action.capitalize()}**: {count}"
                 )
 
     # Detailed changes
     if total_changes > 0:
-        print("\n## Detailed Changes")
-        print("")
+        out.append("\n## Detailed Changes")
+        out.append("")
 
         # Sort actions for consistent output
         for action in ["create", "update", "delete"]:
-            resources = changes_by_action[action]
-            if resources:
-                # Sort resources alphabetically for deterministic output
-                resources.sort(key=lambda x: x[0])
+            addresses = changes_by_action[action]
+            if addresses:
+                symbol = ACTION_MAP[action][1]
 
-                print(f"### {action.capitalize()} ({len(resources)})")
-                print("")
-                for address, symbol in resources:
-                    print(f"- `{symbol} {address}`")
-                print("")
+                out.append(f"### {action.capitalize()} ({len(addresses)})")
+                out.append("")
+                out.extend(f"- `{symbol} {address}`" for address in addresses)
+                out.append("")
 
     # Machine-readable JSON summary
     summary_json = {
@@ -101,19 +213,18 @@ def main():
         "terraform_version": tf_version,
         "total_changes": total_changes,
         "changes_by_action": {
-            action: len(resources) for action, resources in changes_by_action.items()
-        },
-        "resource_list": {
-            action: sorted([addr for addr, _ in resources])
-            for action, resources in changes_by_action.items()
+            action: len(addresses) for action, addresses in changes_by_action.items()
         },
+        "resource_list": dict(changes_by_action),
     }
 
-    print("\n## Machine-Readable Summary")
-    print("")
-    print("```json")
-    print(json.dumps(summary_json, indent=2, sort_keys=True))
-    print("```")
+    out.append("\n## Machine-Readable Summary")
+    out.append("")
+    out.append("```json")
+    out.append(json.dumps(summary_json, indent=2, sort_keys=True))
+    out.append("```")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
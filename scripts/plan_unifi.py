@@ -16,6 +16,7 @@ import argparse
 import json
 import os
 import sys
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -28,6 +29,18 @@ from helpers.unifi_client import UniFiClient  # noqa: E402
 sys.path.insert(0, str(Path(__file__).parent))
 from apply_via_unifi import build_desired_state, load_tfvars  # noqa: E402
 
+# Network fields managed via tfvars, compared by plan and drift detection
+MANAGED_FIELDS = (
+    "vlan",
+    "ip_subnet",
+    "dhcpd_enabled",
+    "dhcpd_start",
+    "dhcpd_stop",
+)
+
+# Tuple of a normalized network's managed field values
+managed_values = itemgetter(*MANAGED_FIELDS)
+
 
 def load_state_file(state_file: Path) -> Optional[Dict[str, Any]]:
     """Load state file if it exists.
@@ -77,20 +90,8 @@ def networks_differ(net1: Dict[str, Any], net2: Dict[str, Any]) -> bool:
     Returns:
         True if networks differ in any managed field
     """
-    # Compare only the fields we manage
-    fields_to_compare = [
-        "vlan",
-        "ip_subnet",
-        "dhcpd_enabled",
-        "dhcpd_start",
-        "dhcpd_stop",
-    ]
-
-    for field in fields_to_compare:
-        if net1.get(field) != net2.get(field):
-            return True
-
-    return False
+    # Compare only the fields we manage, as one tuple comparison
+    return managed_values(net1) != managed_values(net2)
 
 
 def compute_diff(
@@ -202,13 +203,7 @@ def print_diff_summary(diff: Dict[str, Any]) -> None:
             desired = net["desired"]
 
             # Show what's changing
-            for field in [
-                "vlan",
-                "ip_subnet",
-                "dhcpd_enabled",
-                "dhcpd_start",
-                "dhcpd_stop",
-            ]:
+            for field in MANAGED_FIELDS:
                 if current.get(field) != desired.get(field):
                     print(f"      {field}: {current.get(field)} → {desired.get(field)}")
 
@@ -232,13 +227,7 @@ def print_diff_summary(diff: Dict[str, Any]) -> None:
             recorded = net["recorded"]
             actual = net["actual"]
 
-            for field in [
-                "vlan",
-                "ip_subnet",
-                "dhcpd_enabled",
-                "dhcpd_start",
-                "dhcpd_stop",
-            ]:
+            for field in MANAGED_FIELDS:
                 if recorded.get(field) != actual.get(field):
                     rec_val = recorded.get(field)
                     act_val = actual.get(field)
@@ -336,11 +325,12 @@ def main():
     try:
         all_networks = client.get_networks(args.site)
         # Filter to only test networks or networks we manage
+        desired_names = {net["name"] for net in desired}
         actual = [
             net
             for net in all_networks
             if net.get("name", "").startswith("test-")
-            or any(d["name"] == net.get("name") for d in desired)
+            or net.get("name") in desired_names
         ]
         print(f"  Found {len(actual)} managed network(s)")
     finally:
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Tests for apply_via_unifi.py script.
+
+This test suite validates how network configurations are applied, using a
+fake UniFi client so no controller is needed.
+"""
+
+import io
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add parent directory to path for imports
+# This allows importing apply_via_unifi module for testing without
+# requiring a package structure. This is acceptable for simple test scripts
+# in the same directory as the module being tested.
+sys.path.insert(0, str(Path(__file__).parent))
+
+import apply_via_unifi  # noqa: E402
+
+
+class FakeUniFiClient:
+    """In-memory stand-in for the UniFi client used by apply_networks.
+
+    Args:
+        networks: Networks already on the controller
+        delays: Seconds each network name's create/update takes
+        fail_names: Network names the controller rejects
+    """
+
+    def __init__(self, networks=(), delays=None, fail_names=()):
+        self.networks = {net["name"]: dict(net) for net in networks}
+        self.delays = delays or {}
+        self.fail_names = set(fail_names)
+        self.login_threads = []
+        self.writes = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._logged_in = False
+
+    def login(self):
+        self.login_threads.append(threading.current_thread())
+        self._logged_in = True
+
+    def _ensure_logged_in(self):
+        if not self._logged_in:
+            self.login()
+
+    def _write(self, action, config):
+        self._ensure_logged_in()
+        name = config["name"]
+        with self._lock:
+            self.writes.append((action, name))
+            self.inflight += 1
+            self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            time.sleep(self.delays.get(name, 0))
+            if name in self.fail_names:
+                raise RuntimeError(f"controller rejected {name}")
+            with self._lock:
+                if action == "create":
+                    config = {"_id": f"id{self._next_id}", **config}
+                    self._next_id += 1
+                self.networks[name] = dict(config)
+            return dict(config)
+        finally:
+            with self._lock:
+                self.inflight -= 1
+
+    def get_networks(self, site="default"):
+        self._ensure_logged_in()
+        return [dict(net) for net in self.networks.values()]
+
+    def create_network_from_config(self, config, site="default"):
+        return self._write("create", config)
+
+    def update_network(self, network_id, config, site="default"):
+        assert config["_id"] == network_id
+        return self._write("update", config)
+
+
+def network(name, vlan):
+    """Build a network config the way build_network_config does."""
+    return apply_via_unifi.build_network_config(
+        {"name": name, "vlan_id": vlan}, {"cidr": f"10.0.{vlan}.0/24"}
+    )
+
+
+def apply_quietly(client, networks, **kwargs):
+    """Run apply_networks and return (result or raised error, printed output)."""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            result = apply_via_unifi.apply_networks(client, networks, **kwargs)
+        except Exception as e:
+            result = e
+    return result, output.getvalue()
+
+
+def test_network_matches():
+    """Test only a record with every desired field and value counts as a match."""
+    desired = network("lan", 10)
+
+    # Exact match, including extra controller-only fields
+    existing = {"_id": "id1", "site_id": "s1", **desired}
+    assert apply_via_unifi.network_matches(existing, desired)
+
+    # A single differing field
+    assert not apply_via_unifi.network_matches({**existing, "vlan": 11}, desired)
+    assert not apply_via_unifi.network_matches(
+        {**existing, "dhcpd_enabled": False}, desired
+    )
+
+    # Same value with a different type
+    assert not apply_via_unifi.network_matches({**existing, "vlan": "10"}, desired)
+
+    # A desired field missing on the controller, even when desired is None
+    missing = {k: v for k, v in existing.items() if k != "dhcpd_stop"}
+    assert not apply_via_unifi.network_matches(missing, desired)
+    assert not apply_via_unifi.network_matches(existing, {**desired, "note": None})
+
+    print("✅ test_network_matches passed")
+
+
+def test_apply_network_skips_write_only_when_matching():
+    """Test a matching network is left alone and a mismatch is updated."""
+    desired = network("lan", 10)
+    existing = {"_id": "id1", **desired}
+    client = FakeUniFiClient(networks=[existing])
+
+    action, result = apply_via_unifi.apply_network(client, desired, existing)
+    assert (action, result) == ("unchanged", existing)
+    assert client.writes == []
+
+    stale = {**existing, "vlan": "10"}
+    action, result = apply_via_unifi.apply_network(client, desired, stale)
+    assert action == "updated"
+    assert result["vlan"] == 10
+    assert client.writes == [("update", "lan")]
+
+    print("✅ test_apply_network_skips_write_only_when_matching passed")
+
+
+def test_split_unique_name_batches():
+    """Test a repeated name starts a new batch and order is preserved."""
+    networks = [{"name": name} for name in ["a", "b", "a", "c", "b", "b"]]
+
+    batches = apply_via_unifi.split_unique_name_batches(networks)
+
+    assert [[n["name"] for n in batch] for batch in batches] == [
+        ["a", "b"],
+        ["a", "c", "b"],
+        ["b"],
+    ]
+    # Batches hold the original objects, in order
+    assert [n for batch in batches for n in batch] == networks
+
+    assert apply_via_unifi.split_unique_name_batches([]) == []
+
+    print("✅ test_split_unique_name_batches passed")
+
+
+def test_apply_networks_reports_in_input_order_with_jobs():
+    """Test concurrent applies report results and log lines in input order."""
+    names = [f"net-{i}" for i in range(16)]
+    # Earlier networks take longest, so they finish last
+    delays = {name: 0.005 * (len(names) - i) for i, name in enumerate(names)}
+    existing = [{"_id": "old", **network("net-3", 3), "dhcpd_enabled": False}]
+    client = FakeUniFiClient(networks=existing, delays=delays)
+    networks = [network(name, i) for i, name in enumerate(names)]
+
+    result, output = apply_quietly(client, networks, jobs=8)
+
+    assert client.max_inflight > 1
+    assert [n["name"] for n in result["created"]] == [
+        name for name in names if name != "net-3"
+    ]
+    assert [n["name"] for n in result["updated"]] == ["net-3"]
+    assert result["failures"] == []
+
+    processed = [
+        line.split(": ", 1)[1]
+        for line in output.splitlines()
+        if line.startswith("Processing network: ")
+    ]
+    assert processed == names
+
+    # Workers reuse the session logged in on the calling thread
+    assert client.login_threads == [threading.current_thread()]
+
+    print("✅ test_apply_networks_reports_in_input_order_with_jobs passed")
+
+
+def test_apply_networks_repeated_names_see_earlier_result():
+    """Test a repeated name is applied after, and against, its earlier entry."""
+    client = FakeUniFiClient(delays={"lan": 0.02})
+    networks = [network("lan", 10), network("iot", 20), network("lan", 11)]
+
+    result, _ = apply_quietly(client, networks, jobs=8)
+
+    # The first batch may be written in either order; the repeat comes last
+    assert sorted(client.writes[:2]) == [("create", "iot"), ("create", "lan")]
+    assert client.writes[2:] == [("update", "lan")]
+    assert [n["name"] for n in result["created"]] == ["lan", "iot"]
+    assert len(result["updated"]) == 1
+    assert result["updated"][0]["_id"] == result["created"][0]["_id"]
+    assert result["updated"][0]["vlan"] == 11
+
+    print("✅ test_apply_networks_repeated_names_see_earlier_result passed")
+
+
+def test_apply_networks_fail_fast_cancels_queued_work():
+    """Test fail-fast raises the first error and skips networks not started."""
+    names = [f"net-{i}" for i in range(12)]
+    delays = {name: 0.05 for name in names[1:]}
+    networks = [network(name, i) for i, name in enumerate(names)]
+
+    client = FakeUniFiClient(delays=delays, fail_names={"net-0"})
+    result, output = apply_quietly(client, networks, jobs=2, fail_fast=True)
+
+    assert isinstance(result, RuntimeError)
+    assert "net-0" in str(result)
+    assert len(client.writes) < len(names)
+    assert "Processing network: net-1" not in output
+
+    # Without fail-fast every network is attempted and the failure collected
+    client = FakeUniFiClient(delays=delays, fail_names={"net-0"})
+    result, _ = apply_quietly(client, networks, jobs=2)
+
+    assert len(client.writes) == len(names)
+    assert [f["network"] for f in result["failures"]] == ["net-0"]
+    assert [n["name"] for n in result["created"]] == names[1:]
+
+    print("✅ test_apply_networks_fail_fast_cancels_queued_work passed")
+
+
+def run_all_tests():
+    """Run all test functions."""
+    print("=" * 70)
+    print("Running apply_via_unifi.py tests")
+    print("=" * 70)
+    print()
+
+    test_functions = [
+        test_network_matches,
+        test_apply_network_skips_write_only_when_matching,
+        test_split_unique_name_batches,
+        test_apply_networks_reports_in_input_order_with_jobs,
+        test_apply_networks_repeated_names_see_earlier_result,
+        test_apply_networks_fail_fast_cancels_queued_work,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in test_functions:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test_func.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"❌ {test_func.__name__} error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 70)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("=" * 70)
+
+    if failed > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
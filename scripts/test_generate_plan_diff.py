@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Tests for generate-plan-diff.py script.
+
+This test suite validates how Terraform JSON plans are loaded, including the
+streaming parser used for large plans, and how resource changes are
+categorized for the summary.
+"""
+
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# The script name contains a hyphen, so it is loaded from its path instead of
+# being imported by module name
+SCRIPT_PATH = Path(__file__).parent / "generate-plan-diff.py"
+spec = importlib.util.spec_from_file_location("generate_plan_diff", SCRIPT_PATH)
+generate_plan_diff = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(generate_plan_diff)
+
+
+def reduce_plan(plan):
+    """Reduce a fully parsed plan to the fields stream_plan keeps."""
+    reduced = {
+        key: plan[key]
+        for key in ("terraform_version", "format_version", "resource_changes")
+        if key in plan
+    }
+    if isinstance(reduced.get("resource_changes"), list):
+        resources = []
+        for resource in reduced["resource_changes"]:
+            if isinstance(resource, dict):
+                change = resource.get("change")
+                resource = {
+                    key: resource[key]
+                    for key in ("address", "change")
+                    if key in resource
+                }
+                if isinstance(change, dict):
+                    resource["change"] = {
+                        key: change[key] for key in ("actions",) if key in change
+                    }
+            resources.append(resource)
+        reduced["resource_changes"] = resources
+    return reduced
+
+
+def stream_text(text):
+    """Run stream_plan over JSON text."""
+    return generate_plan_diff.stream_plan(io.BytesIO(text.encode("utf-8")))
+
+
+def ijson_missing(test_name):
+    """Report a streaming test as skipped when ijson is not installed."""
+    if generate_plan_diff.ijson is None:
+        print(f"⏭️  {test_name} skipped (ijson not installed)")
+        return True
+    return False
+
+
+def test_stream_plan_matches_json_loads():
+    """Test stream_plan keeps the same summary fields as a full parse."""
+    if ijson_missing("test_stream_plan_matches_json_loads"):
+        return
+
+    # Keys named like the summary fields inside before/after are not picked up
+    nested_state = {
+        "resource_changes": [{"address": "inner", "change": {"actions": ["delete"]}}],
+        "actions": ["delete"],
+        "address": "inner",
+        "format_version": "9.9",
+    }
+    plans = [
+        {
+            "format_version": "1.2",
+            "terraform_version": "1.6.0",
+            "resource_changes": [
+                {
+                    "address": "unifi_network.lan",
+                    "type": "unifi_network",
+                    "change": {
+                        "actions": ["create"],
+                        "before": None,
+                        "after": nested_state,
+                    },
+                },
+                {
+                    "address": "unifi_network.iot",
+                    "change": {
+                        "before": nested_state,
+                        "actions": ["delete", "create"],
+                        "after": {"change": {"actions": ["update"]}},
+                    },
+                },
+            ],
+        },
+        # A null change, a change without actions and empty or null actions
+        {
+            "resource_changes": [
+                {"address": "a", "change": None},
+                {"address": "b", "change": {"before": {}}},
+                {"address": "c", "change": {"actions": []}},
+                {"address": "d", "change": {"actions": None}},
+                {"change": {"actions": ["read"]}},
+            ]
+        },
+        # No resource_changes at all, or a null one
+        {"format_version": "1.2"},
+        {"format_version": "1.2", "resource_changes": None},
+        # Numeric and null versions
+        {"format_version": 1.2, "terraform_version": None, "resource_changes": []},
+        {"format_version": 1, "resource_changes": []},
+    ]
+
+    for plan in plans:
+        text = json.dumps(plan)
+        expected = reduce_plan(json.loads(text))
+        assert stream_text(text) == expected, f"Mismatch for {text}"
+
+    print("✅ test_stream_plan_matches_json_loads passed")
+
+
+def test_load_plan_streams_above_threshold():
+    """Test load_plan returns the same summary fields either way it parses."""
+    if ijson_missing("test_load_plan_streams_above_threshold"):
+        return
+
+    plan = {
+        "format_version": 1.2,
+        "terraform_version": "1.6.0",
+        "resource_changes": [
+            {
+                "address": "unifi_network.lan",
+                "change": {"actions": ["update"], "before": {"vlan": 10}},
+            }
+        ],
+    }
+
+    original_threshold = generate_plan_diff.STREAMING_THRESHOLD_BYTES
+    with tempfile.TemporaryDirectory() as tmpdir:
+        plan_file = Path(tmpdir) / "plan.json"
+        plan_file.write_text(json.dumps(plan))
+
+        # Below the threshold the plan is parsed in full
+        assert generate_plan_diff.load_plan(str(plan_file)) == plan
+
+        try:
+            generate_plan_diff.STREAMING_THRESHOLD_BYTES = 0
+            streamed = generate_plan_diff.load_plan(str(plan_file))
+        finally:
+            generate_plan_diff.STREAMING_THRESHOLD_BYTES = original_threshold
+
+    assert streamed == reduce_plan(plan)
+    assert "before" not in streamed["resource_changes"][0]["change"]
+
+    print("✅ test_load_plan_streams_above_threshold passed")
+
+
+def test_iter_changes():
+    """Test changed resources are categorized and unchanged ones skipped."""
+    resource_changes = [
+        {"address": "a.create", "change": {"actions": ["create"]}},
+        {"address": "a.replace", "change": {"actions": ["delete", "create"]}},
+        {"address": "a.noop", "change": {"actions": ["no-op"]}},
+        {"address": "a.empty", "change": {"actions": []}},
+        {"address": "a.no_actions", "change": {}},
+        {"address": "a.no_change"},
+        {"address": "a.null_change", "change": None},
+        {"address": "a.read", "change": {"actions": ["read"]}},
+        {"change": {"actions": ["update"]}},
+        {"address": "a.forget", "change": {"actions": ["forget"]}},
+    ]
+
+    assert list(generate_plan_diff.iter_changes(resource_changes)) == [
+        ("create", "a.create"),
+        ("delete", "a.replace"),
+        ("read", "a.read"),
+        ("update", "unknown"),
+        # Actions missing from ACTION_MAP are reported under their own name
+        ("forget", "a.forget"),
+    ]
+    assert list(generate_plan_diff.iter_changes([])) == []
+
+    print("✅ test_iter_changes passed")
+
+
+def run_all_tests():
+    """Run all test functions."""
+    print("=" * 70)
+    print("Running generate-plan-diff.py tests")
+    print("=" * 70)
+    print()
+
+    test_functions = [
+        test_stream_plan_matches_json_loads,
+        test_load_plan_streams_above_threshold,
+        test_iter_changes,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in test_functions:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test_func.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"❌ {test_func.__name__} error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 70)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("=" * 70)
+
+    if failed > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -260,24 +260,43 @@ class UniFiClient:
             return self.update_network(network_id, updated_config, site)
         else:
             # Create new network
-            headers = {}
-            if self._csrf_token:
-                headers["X-CSRF-Token"] = self._csrf_token
-
-            response = self.session.post(
-                f"{self.url}/api/s/{site}/rest/networkconf",
-                json=config,
-                headers=headers,
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            result_data = data.get("data", [])
-            if isinstance(result_data, list) and len(result_data) > 0:
-                return result_data[0]
-            else:
-                # If no data returned, query to get the created network
-                return self.find_network_by_name(name, site) or config
+            return self.create_network_from_config(config, site)
+
+    def create_network_from_config(
+        self, config: Dict[str, Any], site: str = "default"
+    ) -> Dict[str, Any]:
+        """Create a network from a full configuration dictionary.
+
+        Unlike create_or_update_network, this does not look up existing
+        networks first. Use it when the caller already knows the name is free.
+
+        Args:
+            config: Network configuration dictionary (must include 'name')
+            site: Site name (default: "default")
+
+        Returns:
+            Created network dictionary
+        """
+        self._ensure_logged_in()
+
+        headers = {}
+        if self._csrf_token:
+            headers["X-CSRF-Token"] = self._csrf_token
+
+        response = self.session.post(
+            f"{self.url}/api/s/{site}/rest/networkconf",
+            json=config,
+            headers=headers,
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        result_data = data.get("data", [])
+        if isinstance(result_data, list) and len(result_data) > 0:
+            return result_data[0]
+        else:
+            # If no data returned, query to get the created network
+            return self.find_network_by_name(config["name"], site) or config
 
     def delete_network_by_name(self, name: str, site: str = "default") -> bool:
         """Delete a network by name.